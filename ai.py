@@ -1,134 +1,882 @@
+import gc
 import random
-from typing import List, Optional, Tuple
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from engine import Board, color, get_captures, get_simple_moves, is_king
+from engine import (
+    CLASSIC,
+    Board,
+    Move,
+    all_captures,
+    all_simple_moves,
+    is_king,
+    legal_moves,
+    position_key,
+)
+from timeman import TimeManager
 
-Move = Tuple[int, int, int, int]
+# Profondeur maximale de l'approfondissement itératif en mode chronométré
+MAX_DEPTH = 32
+
+# Version de l'algorithme de recherche, incluse dans les clés de cache :
+# les résultats enregistrés par une version précédente ne sont pas resservis
+SEARCH_VERSION = 5
+
+# Bornes des entrées de la table de transposition
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+
+# Élagage delta de la quiescence : marge ajoutée au gain d'une prise
+# (points de matériel) avant de la déclarer incapable d'atteindre la fenêtre
+DELTA_MARGIN = 1
+
+# Demi-largeur de la fenêtre d'aspiration de l'analyse multi-PV (points de matériel)
+ASPIRATION_WINDOW = 2
+
+# Score d'une position nulle (répétition, absence de progrès)
+DRAW_SCORE = 0
+
+# Demi-coups réversibles minimum pour revenir à une position déjà vue
+REPETITION_MIN_PLIES = 4
+
+# Entrées de la table de transposition au plus (vidée quand elle est pleine)
+TT_MAX_ENTRIES = 1 << 17
+
+
+class Level:
+    """
+    Niveau de jeu : un profil de budgets pour la même recherche.
+    - `depth` : profondeur maximale de l'approfondissement itératif ;
+    - `nodes` : budget de nœuds ; une recherche qu'il borne est déterministe
+      (à graine égale, même coup sur toute machine) ;
+    - `movetime` : plafond de temps par coup en secondes, donc la latence
+      maximale du niveau (au pire quelques ms de plus, le temps d'atteindre
+      le prochain contrôle) ; la pendule peut seulement le réduire. Quand il
+      est atteint avant le budget de nœuds (niveaux 5 et 6 sur une machine
+      lente ou en 10x10), le coup dépend de la vitesse de la machine ;
+    - `noise` : bruit ajouté à l'évaluation, en points de matériel (fixe
+      pour une position et une graine : les transpositions restent cohérentes) ;
+    - `book` : le niveau peut resservir les analyses du cache partagé et du
+      stockage persistant (position_store.py), seulement sans bruit.
+    """
+
+    __slots__ = ("number", "name", "depth", "nodes", "movetime", "noise", "book")
+
+    def __init__(
+        self, number: int, name: str, depth: int, nodes: int, movetime: float, noise: float = 0.0, book: bool = False
+    ) -> None:
+        self.number = number
+        self.name = name
+        self.depth = depth
+        self.nodes = nodes
+        self.movetime = movetime
+        self.noise = noise
+        self.book = book and not noise
+
+    def __repr__(self) -> str:
+        return f"Level({self.number}, {self.name!r})"
+
+
+LEVELS: Dict[int, Level] = {
+    level.number: level
+    for level in (
+        Level(1, "débutant", depth=1, nodes=500, movetime=0.05, noise=3.0),
+        Level(2, "facile", depth=2, nodes=2_000, movetime=0.1, noise=1.5),
+        Level(3, "moyen", depth=3, nodes=6_000, movetime=0.25, noise=0.5),
+        Level(4, "confirmé", depth=5, nodes=20_000, movetime=0.5, book=True),
+        Level(5, "fort", depth=8, nodes=40_000, movetime=2.0, book=True),
+        Level(6, "expert", depth=MAX_DEPTH, nodes=100_000, movetime=4.0, book=True),
+    )
+}
+
+
+def get_level(number: int) -> Level:
+    try:
+        return LEVELS[number]
+    except KeyError:
+        raise ValueError(f"Niveau inconnu : {number!r} (choix : {', '.join(map(str, LEVELS))})") from None
+
+
+class SearchPool:
+    """
+    Plateaux et listes de coups réutilisés par la recherche, un par demi-coup
+    depuis la racine : la recherche allant en profondeur d'abord, l'enfant
+    d'un nœud n'est plus lu quand son frère prend sa place. Le pool grandit
+    à la demande (profondeur et quiescence) puis n'alloue plus ; il peut
+    servir à plusieurs IA successives d'un même thread (server.py).
+    """
+
+    def __init__(self) -> None:
+        self.boards: List[Board] = []
+        self.buffers: List[List[Move]] = []
+
+    def board(self, ply: int, parent: Board) -> Board:
+        """Plateau du demi-coup `ply`, recopié depuis `parent`."""
+        boards = self.boards
+        while len(boards) <= ply:
+            boards.append(parent.clone())
+        board = boards[ply]
+        board.copy_from(parent)
+        return board
+
+    def moves(self, ply: int) -> List[Move]:
+        """Liste de coups du demi-coup `ply` (remplie par la génération)."""
+        buffers = self.buffers
+        while len(buffers) <= ply:
+            buffers.append([])
+        return buffers[ply]
+
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_restore = False
+
+
+def gc_collections() -> int:
+    """Passages du GC cyclique depuis le lancement, toutes générations confondues."""
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Suspend le ramasse-miettes cyclique le temps d'une recherche : elle ne
+    crée aucun cycle (tout est libéré par comptage de références) et une
+    collection complète en plein calcul bloquerait l'interface. Les
+    recherches simultanées (threads) sont comptées : le GC ne reprend qu'à
+    la fin de la dernière.
+    """
+    global _gc_pauses, _gc_restore
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_restore = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_restore:
+                gc.enable()
+
+
+class SearchTimeout(Exception):
+    """Levée dans la recherche quand le budget (temps ou nœuds) est épuisé."""
+
+
+class SearchStats:
+    """
+    Compteurs d'une recherche minimax, remplis seulement si
+    `AI.collect_stats` est actif (sinon aucun coût dans la boucle chaude).
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.qnodes = 0
+        self.delta_prunes = 0
+        self.cutoffs = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.elapsed = 0.0
+        self.time_movegen = 0.0
+        self.time_eval = 0.0
+        self.time_clone = 0.0
+        self.peak_kib = 0.0
+        self.score: float = 0
+        self.pv: List[Move] = []
+
+    @property
+    def branching_factor(self) -> float:
+        """Facteur de branchement effectif : nodes ** (1 / depth)."""
+        if self.depth <= 0 or self.nodes <= 1:
+            return 0.0
+        return self.nodes ** (1.0 / self.depth)
+
+    def summary_lines(self) -> List[str]:
+        pv = " ".join(f"{m.r}{m.c}-{m.r2}{m.c2}" for m in self.pv) or "-"
+        return [
+            f"prof. {self.depth}  score {self.score}  {self.elapsed * 1000:.1f} ms",
+            f"noeuds {self.nodes}  feuilles {self.leaf_evals}  coupures {self.cutoffs}  EBF {self.branching_factor:.2f}",
+            f"TT {self.tt_hits}/{self.tt_probes}  quiescence {self.qnodes}  delta {self.delta_prunes}",
+            f"gen {self.time_movegen * 1000:.1f} ms  eval {self.time_eval * 1000:.1f} ms  clone {self.time_clone * 1000:.1f} ms",
+            f"pic mémoire {self.peak_kib:.1f} Kio",
+            f"PV {pv}",
+        ]
+
+
+class Candidate:
+    """Coup candidat d'une analyse multi-PV (score du point de vue du camp au trait)."""
+
+    __slots__ = ("move", "score", "pv")
+
+    def __init__(self, move: Move, score: float, pv: List[Move]) -> None:
+        self.move = move
+        self.score = score
+        self.pv = pv
+
+    def __repr__(self) -> str:
+        return f"Candidate({self.move!r}, {self.score})"
+
+
+class Evaluator:
+    """
+    Évaluation statique d'une position, en points de matériel (pion = 1),
+    du point de vue du camp `col`. Un évaluateur `incremental` reçoit
+    chaque coup simulé par la recherche via `push`, pour mettre à jour son
+    état attaché au plateau enfant au lieu de tout recalculer à la feuille.
+    """
+
+    name = "abstrait"
+    incremental = False
+
+    def evaluate(self, board: Board, col: int) -> float:
+        raise NotImplementedError
+
+    def push(self, parent: Board, child: Board, move: Move) -> None:
+        """Appelé après `child.apply(move)`, `parent` étant la position d'avant."""
+
+
+class MaterialEvaluator(Evaluator):
+    name = "materiel"
+
+    def evaluate(self, board: Board, col: int) -> float:
+        # matériel tenu à jour par Board : pas de parcours du plateau
+        men, kings = board.material(col)
+        opp_men, opp_kings = board.material(-col)
+        return (men + 3 * kings) - (opp_men + 3 * opp_kings)
 
 
 class AI:
-    def __init__(self, engine, level: int = 1):
+    def __init__(
+        self,
+        engine,
+        level: int = 1,
+        collect_stats: bool = False,
+        cache=None,
+        evaluator: Optional[Evaluator] = None,
+        seed: Optional[int] = None,
+        memory_bounded: bool = True,
+        pool: Optional[SearchPool] = None,
+    ):
         self.engine = engine
         self.level = level
+        self.cache = cache  # AnalysisCache partagé optionnel (voir analysis_cache.py)
         self.ai_color = 1
+        self.collect_stats = collect_stats
+        self.stats: Optional[SearchStats] = None
+        self.last_stats: Optional[SearchStats] = None
+        # passages du GC pendant la dernière recherche, comptés à l'intérieur
+        # de la fenêtre où il est suspendu (la reprise n'est pas comptée)
+        self.last_gc_collections = 0
+        self.time_manager = TimeManager()
+        self.evaluator: Evaluator = evaluator if evaluator is not None else MaterialEvaluator()
+        # générateur propre à l'instance : à graine égale, même bruit d'évaluation.
+        # Sans graine, une graine est tirée et gardée dans `seed` pour pouvoir rejouer.
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self._noise_salt = self.rng.getrandbits(64)
+        self._noise = 0.0
+        # coup de la TT stocké par son indice dans la liste des coups légaux
+        # (génération déterministe) : un petit entier ne coûte rien en mémoire
+        self.tt: Dict[int, Tuple[int, int, float, int]] = {}
+        self._pv: List[List[Move]] = []
+        self._deadline: Optional[float] = None
+        self._node_limit: Optional[int] = None
+        self._nodes = 0
+        self._root_best: Tuple[Optional[Move], float] = (None, float("-inf"))
+        # faux si la dernière recherche a été coupée par l'horloge (échéance,
+        # `stop`) : son résultat dépend de la machine et n'est pas mis en cache
+        self.last_complete = True
+        # appelé après chaque profondeur terminée : (profondeur, coup, score)
+        self.on_iteration: Optional[Callable[[int, Move, float], None]] = None
+        self._stopped = False
+        # classement de la dernière profondeur terminée par `analyse`
+        self.candidates: List[Candidate] = []
+        # positions de la partie et du chemin courant de la recherche
+        # (depuis le dernier coup irréversible) : une répétition est nulle
+        self._seen: Dict[int, int] = {}
+        # mode mémoire bornée : plateaux et listes de coups tirés du pool,
+        # GC suspendu pendant la recherche. Sinon, un plateau neuf par nœud.
+        self.pool: Optional[SearchPool] = (pool if pool is not None else SearchPool()) if memory_bounded else None
+
+    @property
+    def profile(self) -> Level:
+        return get_level(self.level)
 
-    def choose_move(self) -> Optional[Move]:
+    def choose_move(self, time_left: Optional[float] = None, increment: float = 0.0) -> Optional[Move]:
+        """
+        Coup du niveau `level` (voir LEVELS) : même recherche pour tous les
+        niveaux, bornée par les budgets du profil. `time_left` / `increment` :
+        pendule restante du camp au trait (secondes), qui peut réduire le
+        plafond de temps du niveau.
+        """
         self.ai_color = self.engine.turn
-        if self.level == 1:
-            return self.random_move()
-        elif self.level == 2:
-            return self.greedy_move()
-        else:
-            return self.minimax_move()
+        self.last_stats = None
+        profile = self.profile
+        budget = profile.movetime
+        if time_left is not None:
+            budget = min(budget, self.time_budget(time_left, increment))
+        deadline = perf_counter() + budget
+        self._noise = profile.noise
+        try:
+            if profile.book:
+                best_move, _ = self.search(profile.depth, deadline, profile.nodes)
+            else:
+                # bruit propre à la graine : résultat hors cache
+                best_move, _ = self._search(profile.depth, deadline, profile.nodes)
+        finally:
+            self._noise = 0.0
+        return best_move
 
-    # --- Public strategies ---
-    def random_move(self) -> Optional[Move]:
-        moves = self.all_legal_moves(self.engine.board, self.engine.turn)
-        if not moves:
-            return None
-        return random.choice(moves)
+    def time_budget(self, time_left: float, increment: float) -> float:
+        board, turn = self.engine.board, self.engine.turn
+        pieces = len(board.pieces[1]) + len(board.pieces[-1])
+        captures = self.all_captures(board, turn)
+        legal = len(captures) if captures else len(self.all_simple_moves(board, turn))
+        return self.time_manager.budget(time_left, increment, pieces, legal, bool(captures))
 
-    def greedy_move(self) -> Optional[Move]:
-        captures = self.all_captures(self.engine.board, self.engine.turn)
-        if captures:
-            return random.choice(captures)
+    def search(
+        self, depth: int, deadline: Optional[float] = None, nodes: Optional[int] = None
+    ) -> Tuple[Optional[Move], float]:
+        """
+        Approfondissement itératif jusqu'à `depth` demi-coups depuis la position
+        courante. Si `deadline` (horloge perf_counter) est dépassée ou si plus de
+        `nodes` nœuds sont visités, la recherche s'arrête et rend le meilleur
+        coup connu (à défaut, le premier coup légal dans l'ordre canonique).
+        Retourne (meilleur coup, score) du point de vue du camp au trait.
 
-        moves = self.all_simple_moves(self.engine.board, self.engine.turn)
-        if not moves:
+        Avec un cache partagé, les positions déjà analysées (mêmes réglages)
+        sont servies sans recherche, sauf au milieu d'une suite de coups de
+        dames : le score dépend alors de l'historique (nulles). Seules les
+        recherches terminées sur leur profondeur ou leur budget de nœuds sont
+        gardées : une recherche coupée par l'échéance ne vaut pas la clé.
+        """
+        if self.cache is None or self.engine.board.quiet_plies:
+            return self._search(depth, deadline, nodes)
+        board = self.engine.board
+        settings = self.search_settings(depth, deadline, board.variant.name, self.evaluator.name, nodes)
+        key = (position_key(board, self.engine.turn), settings)
+        compact, score = self.cache.get_or_compute(
+            key, lambda: self._search_compact(depth, deadline, nodes), keep=lambda _: self.last_complete
+        )
+        return self.resolve_move(compact), score
+
+    def _search_compact(
+        self, depth: int, deadline: Optional[float], nodes: Optional[int]
+    ) -> Tuple[Optional[Tuple[int, ...]], float]:
+        # le cache (et le stockage sur disque) ne garde que des tuples, prises
+        # comprises : deux rafles peuvent avoir les mêmes extrémités
+        move, score = self._search(depth, deadline, nodes)
+        return (move.as_compact() if move is not None else None), score
+
+    def resolve_move(self, compact: Optional[Sequence[int]]) -> Optional[Move]:
+        """
+        Retrouve le coup légal correspondant à un tuple `Move.as_compact`, ou
+        (r, c, r2, c2) seul : la première rafle de mêmes extrémités est alors rendue.
+        """
+        if compact is None:
             return None
+        for move in self.all_legal_moves(self.engine.board, self.engine.turn):
+            if move.matches(compact):
+                return move
+        return None
+
+    def stop(self) -> None:
+        """
+        Interrompt la recherche en cours (depuis un autre thread) et les
+        suivantes, y compris une recherche qui n'a pas encore commencé : le
+        drapeau n'est jamais remis à zéro, une IA arrêtée ne sert plus.
+        """
+        self._stopped = True
+        self._deadline = float("-inf")
 
-        direction = -1 if self.engine.turn == 1 else 1
-        forward_moves = [m for m in moves if (m[2] - m[0]) == direction]
-        if forward_moves:
-            return forward_moves[0]
-        return moves[0]
+    @staticmethod
+    def search_settings(
+        depth: int,
+        deadline: Optional[float] = None,
+        variant: str = CLASSIC.name,
+        evaluator: str = MaterialEvaluator.name,
+        nodes: Optional[int] = None,
+    ) -> Tuple:
+        """
+        Partie « réglages » de la clé de cache d'une recherche. Un budget de
+        nœuds l'emporte sur l'échéance : c'est lui qui borne normalement un niveau.
+        """
+        if nodes is not None:
+            return ("nodes", depth, nodes, variant, evaluator, SEARCH_VERSION)
+        if deadline is not None:
+            return ("timed", variant, evaluator, SEARCH_VERSION)
+        return ("depth", depth, variant, evaluator, SEARCH_VERSION)
+
+    def _search(
+        self, depth: int, deadline: Optional[float], nodes: Optional[int] = None
+    ) -> Tuple[Optional[Move], float]:
+        return self._bounded(self._deepen, depth, deadline, nodes)
+
+    def _bounded(self, search: Callable[..., Any], *args: Any) -> Any:
+        """
+        Exécute `search` avec le GC suspendu en mode mémoire bornée, puis
+        libère la table de transposition : la mémoire revient au même niveau
+        entre deux recherches. Avec les statistiques, le pic de mémoire Python
+        de la recherche est mesuré (tracemalloc, qui la ralentit nettement).
+        """
+        measure = self.collect_stats
+        if measure:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            self.last_stats = None
+        try:
+            if self.pool is None:
+                return self._counting_gc(search, *args)
+            with gc_paused():
+                return self._counting_gc(search, *args)
+        finally:
+            self.tt = {}
+            if measure:
+                peak = tracemalloc.get_traced_memory()[1]
+                if started:
+                    tracemalloc.stop()
+                if self.last_stats is not None:
+                    self.last_stats.peak_kib = (peak - base) / 1024
+
+    def _counting_gc(self, search: Callable[..., Any], *args: Any) -> Any:
+        collections = gc_collections()
+        try:
+            return search(*args)
+        finally:
+            self.last_gc_collections = gc_collections() - collections
+
+    def _deepen(
+        self, depth: int, deadline: Optional[float], nodes: Optional[int]
+    ) -> Tuple[Optional[Move], float]:
+        self.ai_color = self.engine.turn
+        stats = SearchStats() if self.collect_stats else None
+        self.stats = stats
+        self.tt = {}
+        self._nodes = 0
+        self._node_limit = nodes
+        self.last_complete = False
+        complete = True
+        start = perf_counter()
 
-    def minimax_move(self) -> Optional[Move]:
         best_score = float("-inf")
         best_move: Optional[Move] = None
-        legal_moves = self.all_legal_moves(self.engine.board, self.engine.turn)
-        for move in legal_moves:
-            board_copy = self.apply_move_sim(self.engine.board, move)
-            score = self.minimax(board_copy, 2, False)
+        pv: List[Move] = []
+        # ordre de départ canonique : à égalité de score, le coup choisi ne
+        # dépend pas du chemin par lequel la position a été atteinte
+        root_moves = sorted(self.all_legal_moves(self.engine.board, self.engine.turn), key=Move.sort_key)
+        for d in range(1, depth + 1):
+            if not root_moves:
+                break
+            # échéance posée avant de lire `_stopped` : un `stop` concurrent
+            # n'est jamais écrasé (voir aussi `_out_of_budget`)
+            self._deadline = deadline
+            if self._stopped:
+                complete = False
+                break
+            self._pv = [[] for _ in range(d + 1)]
+            self._root_best = (None, float("-inf"))
+            self._seen = dict(self.engine.repetitions)
+            try:
+                self._search_root(root_moves, d)
+            except SearchTimeout:
+                # coupure par le budget de nœuds : déterministe ; sinon l'horloge
+                complete = nodes is not None and self._nodes > nodes
+                # itération incomplète : le coup précédent est cherché en premier,
+                # tout coup terminé avec un meilleur score reste fiable
+                if self._root_best[0] is not None:
+                    best_move, best_score = self._root_best
+                    pv = self._pv[0]
+                elif best_move is None:
+                    # budget épuisé avant le premier coup : la latence prime
+                    best_move = root_moves[0]
+                    best_score = self.evaluate(self.apply_move_sim(self.engine.board, best_move))
+                    pv = [best_move]
+                break
+            best_move, best_score = self._root_best
+            pv = self._pv[0]
+            if stats is not None:
+                stats.depth = d
+            if self.on_iteration is not None:
+                self.on_iteration(d, best_move, best_score)
+            root_moves.remove(best_move)
+            root_moves.insert(0, best_move)
+            # une itération coûte plusieurs fois la précédente : inutile de
+            # la commencer si plus de la moitié du budget est consommée
+            if nodes is not None and self._nodes > nodes // 2:
+                break
+            if deadline is not None and perf_counter() > start + (deadline - start) * 0.5:
+                complete = False
+                break
+
+        self._deadline = None
+        self._node_limit = None
+        self.last_complete = complete
+        if stats is not None:
+            stats.elapsed = perf_counter() - start
+            stats.score = best_score
+            stats.pv = pv
+            self.last_stats = stats
+            self.stats = None
+        return best_move, best_score
+
+    def _search_root(self, root_moves: List[Move], depth: int) -> None:
+        best_score = float("-inf")
+        if self.stats is not None:
+            self.stats.nodes += 1
+        for move in root_moves:
+            board_copy = self._child(self.engine.board, move, 1)
+            score = self.minimax(board_copy, depth - 1, False, best_score, float("inf"), 1)
             if score > best_score:
                 best_score = score
-                best_move = move
-        return best_move
+                self._root_best = (move, score)
+                self._pv[0] = [move] + self._pv[1]
 
-    # --- Utilities ---
-    def all_captures(self, board: Board, player: int) -> List[Move]:
-        captures: List[Move] = []
-        for r in range(8):
-            for c in range(8):
-                if color(board.grid[r][c]) == player:
-                    for r2, c2, mr, mc in get_captures(board, r, c):
-                        captures.append((r, c, r2, c2))
-        return captures
+    def analyse(self, depth: int, k: int = 3, deadline: Optional[float] = None) -> List[Candidate]:
+        """
+        Analyse multi-PV : les `k` meilleurs coups de la position courante,
+        du meilleur au moins bon, chacun avec son score et sa variante
+        principale. Une seule recherche (approfondissement itératif) : un coup
+        hors du top k est réfuté par une fenêtre bornée par le k-ième score,
+        les candidats sont cherchés dans une fenêtre d'aspiration centrée sur
+        leur score de l'itération précédente (nouvelle recherche si elle échoue).
+        """
+        return self._bounded(self._analyse, depth, k, deadline)
 
-    def all_simple_moves(self, board: Board, player: int) -> List[Move]:
-        moves: List[Move] = []
-        for r in range(8):
-            for c in range(8):
-                if color(board.grid[r][c]) == player:
-                    for r2, c2 in get_simple_moves(board, r, c):
-                        moves.append((r, c, r2, c2))
-        return moves
-
-    def all_legal_moves(self, board: Board, player: int) -> List[Move]:
-        captures = self.all_captures(board, player)
-        if captures:
-            return captures
-        return self.all_simple_moves(board, player)
+    def _analyse(self, depth: int, k: int, deadline: Optional[float]) -> List[Candidate]:
+        self.ai_color = self.engine.turn
+        # les variantes principales ne sont suivies qu'avec des statistiques
+        stats = SearchStats()
+        self.stats = stats
+        self.tt = {}
+        self._nodes = 0
+        self._node_limit = None
+        start = perf_counter()
 
-    def apply_move_sim(self, board: Board, move: Move) -> Board:
-        r, c, r2, c2 = move
-        piece = board.grid[r][c]
-        new_board = board.clone()
+        ranked: List[Candidate] = []
+        previous: Dict[Move, float] = {}
+        root_moves = sorted(self.all_legal_moves(self.engine.board, self.engine.turn), key=Move.sort_key)
+        for d in range(1, depth + 1):
+            if not root_moves:
+                break
+            self._deadline = deadline if d > 1 else None
+            if self._stopped:
+                break
+            self._pv = [[] for _ in range(d + 1)]
+            self._seen = dict(self.engine.repetitions)
+            try:
+                ranked = self._search_root_multi(root_moves, d, k, previous)
+            except SearchTimeout:
+                break  # itération incomplète : classement de la précédente
+            stats.depth = d
+            self.candidates = ranked
+            if self.on_iteration is not None:
+                self.on_iteration(d, ranked[0].move, ranked[0].score)
+            previous = {cand.move: cand.score for cand in ranked}
+            # candidats d'abord : le k-ième score (plancher) est connu plus tôt
+            root_moves = [cand.move for cand in ranked] + [m for m in root_moves if m not in previous]
+            if deadline is not None and perf_counter() > start + (deadline - start) * 0.5:
+                break
+
+        self._deadline = None
+        stats.elapsed = perf_counter() - start
+        if ranked:
+            stats.score = ranked[0].score
+            stats.pv = ranked[0].pv
+        if self.collect_stats:
+            self.last_stats = stats
+        self.stats = None
+        return ranked
+
+    def _search_root_multi(
+        self, root_moves: List[Move], depth: int, k: int, previous: Dict[Move, float]
+    ) -> List[Candidate]:
+        ranked: List[Candidate] = []
+        self.stats.nodes += 1
+        for move in root_moves:
+            board_copy = self._child(self.engine.board, move, 1)
+            floor = ranked[-1].score if len(ranked) >= k else float("-inf")
+            guess = previous.get(move)
+            if guess is not None:
+                alpha, beta = max(floor, guess - ASPIRATION_WINDOW), guess + ASPIRATION_WINDOW
+            else:
+                alpha, beta = floor, float("inf")
+            score = self.minimax(board_copy, depth - 1, False, alpha, beta, 1)
+            if (alpha > floor and score <= alpha) or score >= beta:
+                # hors de la fenêtre d'aspiration : fenêtre complète au-dessus du plancher
+                score = self.minimax(board_copy, depth - 1, False, floor, float("inf"), 1)
+            if score <= floor:
+                continue  # ne peut pas entrer dans le top k
+            ranked.append(Candidate(move, score, [move] + self._pv[1]))
+            ranked.sort(key=lambda cand: -cand.score)
+            del ranked[k:]
+        return ranked
 
-        # handle capture removal
-        caps = get_captures(board, r, c)
-        captured = next(((mr, mc) for (er, ec, mr, mc) in caps if (er, ec) == (r2, c2)), None)
-        if captured:
-            mr, mc = captured
-            new_board.grid[mr][mc] = 0
+    # --- Utilities ---
+    def all_captures(self, board: Board, player: int, out: Optional[List[Move]] = None) -> List[Move]:
+        return all_captures(board, player, out)
 
-        new_board.grid[r][c] = 0
-        new_board.grid[r2][c2] = piece
+    def all_simple_moves(self, board: Board, player: int) -> List[Move]:
+        return all_simple_moves(board, player)
 
-        if r2 == 0 and piece == 1:
-            new_board.grid[r2][c2] = 2
-        elif r2 == 7 and piece == -1:
-            new_board.grid[r2][c2] = -2
+    def all_legal_moves(self, board: Board, player: int, out: Optional[List[Move]] = None) -> List[Move]:
+        return legal_moves(board, player, out)
 
+    def apply_move_sim(self, board: Board, move: Move) -> Board:
+        stats = self.stats
+        if stats is None:
+            new_board = board.clone()
+        else:
+            t0 = perf_counter()
+            new_board = board.clone()
+            stats.time_clone += perf_counter() - t0
+        new_board.apply(move)
+        if self.evaluator.incremental:
+            self.evaluator.push(board, new_board, move)
         return new_board
 
-    def evaluate(self, board: Board) -> int:
-        score = 0
-        for r in range(8):
-            for c in range(8):
-                piece = board.grid[r][c]
-                if piece == 0:
-                    continue
-                value = 3 if is_king(piece) else 1
-                score += value if color(piece) == self.ai_color else -value
+    def _child(self, board: Board, move: Move, ply: int) -> Board:
+        """Comme `apply_move_sim`, sur le plateau du pool pour le demi-coup `ply`."""
+        pool = self.pool
+        if pool is None:
+            return self.apply_move_sim(board, move)
+        stats = self.stats
+        if stats is None:
+            child = pool.board(ply, board)
+        else:
+            t0 = perf_counter()
+            child = pool.board(ply, board)
+            stats.time_clone += perf_counter() - t0
+        child.apply(move)
+        if self.evaluator.incremental:
+            self.evaluator.push(board, child, move)
+        return child
+
+    def evaluate(self, board: Board) -> float:
+        score = self.evaluator.evaluate(board, self.ai_color)
+        if self._noise:
+            # bruit dans [-noise, noise], fonction du hash et de la graine
+            bits = ((board.hash ^ self._noise_salt) * 0x9E3779B97F4A7C15 >> 32) & 0xFFFF
+            score += self._noise * (bits / 0x8000 - 1.0)
         return score
 
-    def minimax(self, board: Board, depth: int, maximizing: bool) -> int:
+    def _out_of_budget(self) -> bool:
+        """Contrôlé tous les 256 nœuds : arrêt demandé, échéance dépassée ou budget de nœuds consommé."""
+        return self._stopped or (self._deadline is not None and perf_counter() > self._deadline) or (
+            self._node_limit is not None and self._nodes > self._node_limit
+        )
+
+    def minimax(
+        self,
+        board: Board,
+        depth: int,
+        maximizing: bool,
+        alpha: float = float("-inf"),
+        beta: float = float("inf"),
+        ply: int = 0,
+    ) -> float:
+        """
+        Minimax avec élagage alpha-beta (même valeur que le minimax complet)
+        et table de transposition pour les nœuds de profondeur >= 2.
+        Une position déjà vue dans la partie ou sur le chemin, ou atteinte
+        après trop de coups sans progrès, vaut DRAW_SCORE.
+        """
+        self._nodes += 1
+        if not self._nodes & 255 and self._out_of_budget():
+            raise SearchTimeout()
+
         player = self.ai_color if maximizing else -self.ai_color
-        legal_moves = self.all_legal_moves(board, player)
+        stats = self.stats
+
+        # sans dame, tout coup est irréversible : aucune répétition possible
+        key = 0
+        tracked = board.kings[1] or board.kings[-1]
+        if tracked:
+            key = position_key(board, player)
+            quiet = board.quiet_plies
+            if quiet >= board.variant.no_progress_plies or (
+                quiet >= REPETITION_MIN_PLIES and key in self._seen
+            ):
+                if stats is not None and ply < len(self._pv):
+                    self._pv[ply] = []
+                return DRAW_SCORE
+        pool = self.pool
+        out = pool.moves(ply) if pool is not None else None
+        if stats is None:
+            legal_moves = self.all_legal_moves(board, player, out)
+        else:
+            stats.nodes += 1
+            t0 = perf_counter()
+            legal_moves = self.all_legal_moves(board, player, out)
+            stats.time_movegen += perf_counter() - t0
+
+        if depth == 0 and legal_moves and legal_moves[0].captures:
+            # horizon au milieu d'un échange : on prolonge par les prises
+            if stats is not None and ply < len(self._pv):
+                self._pv[ply] = []
+            return self.quiesce(board, maximizing, alpha, beta, legal_moves, ply)
 
         if depth == 0 or not legal_moves:
-            return self.evaluate(board)
+            if stats is None:
+                return self.evaluate(board)
+            if ply < len(self._pv):
+                self._pv[ply] = []
+            stats.leaf_evals += 1
+            t0 = perf_counter()
+            score = self.evaluate(board)
+            stats.time_eval += perf_counter() - t0
+            return score
 
+        ordered = legal_moves
+        if depth >= 2:
+            if not tracked:
+                key = position_key(board, player)
+            entry = self.tt.get(key)
+            if stats is not None:
+                stats.tt_probes += 1
+            if entry is not None:
+                tt_depth, flag, tt_value, tt_index = entry
+                if tt_depth >= depth and (
+                    flag == TT_EXACT
+                    or (flag == TT_LOWER and tt_value >= beta)
+                    or (flag == TT_UPPER and tt_value <= alpha)
+                ):
+                    if stats is not None:
+                        stats.tt_hits += 1
+                        self._pv[ply] = [legal_moves[tt_index]] if tt_index >= 0 else []
+                    return tt_value
+                if tt_index > 0:
+                    ordered = legal_moves[:]
+                    ordered.insert(0, ordered.pop(tt_index))
+
+        alpha_orig, beta_orig = alpha, beta
+        best_move: Optional[Move] = None
+        seen = self._seen
+        if tracked:
+            seen[key] = seen.get(key, 0) + 1
         if maximizing:
             value = float("-inf")
-            for move in legal_moves:
-                next_board = self.apply_move_sim(board, move)
-                value = max(value, self.minimax(next_board, depth - 1, False))
-            return value
+            for move in ordered:
+                next_board = self._child(board, move, ply + 1)
+                score = self.minimax(next_board, depth - 1, False, alpha, beta, ply + 1)
+                if score > value:
+                    value = score
+                    best_move = move
+                    if stats is not None:
+                        self._pv[ply] = [move] + self._pv[ply + 1]
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break
         else:
             value = float("inf")
-            for move in legal_moves:
-                next_board = self.apply_move_sim(board, move)
-                value = min(value, self.minimax(next_board, depth - 1, True))
-            return value
+            for move in ordered:
+                next_board = self._child(board, move, ply + 1)
+                score = self.minimax(next_board, depth - 1, True, alpha, beta, ply + 1)
+                if score < value:
+                    value = score
+                    best_move = move
+                    if stats is not None:
+                        self._pv[ply] = [move] + self._pv[ply + 1]
+                beta = min(beta, value)
+                if alpha >= beta:
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break
+        if tracked:
+            seen[key] -= 1
+            if not seen[key]:
+                del seen[key]
+
+        if depth >= 2:
+            if value <= alpha_orig:
+                flag = TT_UPPER
+            elif value >= beta_orig:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            index = next((i for i, m in enumerate(legal_moves) if m is best_move), -1)
+            tt = self.tt
+            if len(tt) >= TT_MAX_ENTRIES:
+                tt.clear()
+            tt[key] = (depth, flag, value, index)
+        return value
+
+    def quiesce(
+        self,
+        board: Board,
+        maximizing: bool,
+        alpha: float,
+        beta: float,
+        captures: Optional[List[Move]] = None,
+        ply: int = 0,
+    ) -> float:
+        """
+        Quiescence : au-delà de l'horizon, seules les prises (obligatoires)
+        sont jouées, jusqu'à une position calme qui seule est évaluée.
+        Élagage delta : une prise dont le gain, même augmenté de DELTA_MARGIN,
+        ne peut pas faire entrer le score dans la fenêtre n'est pas explorée ;
+        sa borne optimiste est rendue à la place.
+        """
+        player = self.ai_color if maximizing else -self.ai_color
+        stats = self.stats
+        if captures is None:
+            self._nodes += 1
+            if not self._nodes & 255 and self._out_of_budget():
+                raise SearchTimeout()
+            if stats is not None:
+                stats.qnodes += 1
+            pool = self.pool
+            captures = self.all_captures(board, player, pool.moves(ply) if pool is not None else None)
+            if not captures:
+                if stats is not None:
+                    stats.leaf_evals += 1
+                return self.evaluate(board)
+
+        static = self.evaluate(board)
+        grid = board.grid
+        if maximizing:
+            value = float("-inf")
+            for move in captures:
+                optimistic = static + _capture_gain(grid, move) + DELTA_MARGIN
+                if optimistic <= alpha:
+                    if stats is not None:
+                        stats.delta_prunes += 1
+                    value = max(value, optimistic)
+                    continue
+                score = self.quiesce(self._child(board, move, ply + 1), False, alpha, beta, None, ply + 1)
+                value = max(value, score)
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    break
+        else:
+            value = float("inf")
+            for move in captures:
+                optimistic = static - _capture_gain(grid, move) - DELTA_MARGIN
+                if optimistic >= beta:
+                    if stats is not None:
+                        stats.delta_prunes += 1
+                    value = min(value, optimistic)
+                    continue
+                score = self.quiesce(self._child(board, move, ply + 1), True, alpha, beta, None, ply + 1)
+                value = min(value, score)
+                beta = min(beta, value)
+                if alpha >= beta:
+                    break
+        return value
+
+
+def _capture_gain(grid: List[List[int]], move: Move) -> int:
+    """Matériel gagné par une prise (pièces prises, plus une promotion éventuelle)."""
+    gain = sum(3 if is_king(grid[mr][mc]) else 1 for mr, mc in move.captures)
+    return gain + 2 if move.promotion else gain
@@ -0,0 +1,169 @@
+# analyse.py : analyse hors-ligne d'une base de parties sur un pool de processus
+"""
+Rejoue des parties enregistrées à travers `Engine` et annote chaque position
+avec le meilleur coup et le score trouvés par `AI`.
+
+Format d'entrée : une partie par ligne, coups séparés par des espaces,
+chaque coup noté « rc-r2c2 » (ou « rcxr2c2 » pour une prise), par ex. :
+
+    52-43 25-34 43x25
+
+Les lignes vides et celles commençant par « # » sont ignorées. Les fichiers
+« .gz » sont décompressés à la volée.
+
+Sortie : une ligne JSON par coup joué, écrite au fil de l'eau. Avec
+`--multipv K`, chaque ligne liste aussi les K meilleurs coups (score et
+variante principale), calculés en une seule recherche. `--variante` choisit
+les règles (plateau 10x10 pour l'internationale).
+
+    python3 analyse.py parties.txt -o annotations.jsonl -j 8 --depth 3
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+from collections import deque
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from ai import AI
+from analysis_cache import AnalysisCache
+from engine import Engine, Move, MoveTuple, get_variant
+
+Game = Tuple[int, List[str]]
+Annotation = Dict[str, Any]
+
+# Un cache par processus worker : les ouvertures communes ne sont cherchées qu'une fois
+_cache = AnalysisCache(max_entries=200_000, ttl=None)
+
+
+def parse_move(token: str, size: int = 8) -> MoveTuple:
+    sep = "x" if "x" in token else "-"
+    src, dst = token.split(sep)
+    if len(src) != 2 or len(dst) != 2:
+        raise ValueError(f"coup illisible : {token!r}")
+    move = (int(src[0]), int(src[1]), int(dst[0]), int(dst[1]))
+    if not all(0 <= v < size for v in move):
+        raise ValueError(f"coup hors du plateau : {token!r}")
+    return move
+
+
+def format_move(move: Optional[Move]) -> Optional[str]:
+    if move is None:
+        return None
+    return str(move)
+
+
+def read_games(path: str) -> Iterator[Game]:
+    """Générateur paresseux : une partie à la fois, jamais l'archive entière."""
+    if path == "-":
+        stream: TextIO = sys.stdin
+    elif path.endswith(".gz"):
+        stream = gzip.open(path, "rt", encoding="utf-8")
+    else:
+        stream = open(path, "r", encoding="utf-8")
+    try:
+        for line_no, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            yield line_no, line.split()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def analyse_game(game: Game, depth: int, multipv: int = 1, variant: str = "classique") -> List[Annotation]:
+    """Rejoue une partie et annote chaque position (exécuté dans un worker)."""
+    game_id, tokens = game
+    engine = Engine(get_variant(variant))
+    ai = AI(engine, level=3, cache=_cache)
+    annotations: List[Annotation] = []
+
+    for ply, token in enumerate(tokens):
+        entry: Annotation = {"game": game_id, "ply": ply, "played": token}
+        try:
+            r, c, r2, c2 = parse_move(token, engine.variant.size)
+        except ValueError as exc:
+            entry["error"] = str(exc)
+            annotations.append(entry)
+            break
+
+        entry["turn"] = engine.turn
+        if multipv > 1:
+            candidates = ai.analyse(depth, multipv)
+            entry["best"] = format_move(candidates[0].move) if candidates else None
+            entry["score"] = candidates[0].score if candidates else None
+            entry["candidates"] = [
+                {"move": format_move(cand.move), "score": cand.score, "pv": [format_move(m) for m in cand.pv]}
+                for cand in candidates
+            ]
+        else:
+            best, score = ai.search(depth)
+            entry["best"] = format_move(best)
+            entry["score"] = score if best is not None else None
+
+        if not engine.move_piece(r, c, r2, c2):
+            entry["error"] = "coup illégal"
+            annotations.append(entry)
+            break
+        annotations.append(entry)
+
+    return annotations
+
+
+def _analyse_task(args: Tuple[Game, int, int, str]) -> List[Annotation]:
+    game, depth, multipv, variant = args
+    return analyse_game(game, depth, multipv, variant)
+
+
+def bounded_imap(pool, func: Callable, items: Iterable, max_pending: int) -> Iterator:
+    """
+    Comme `Pool.imap`, mais ne soumet jamais plus de `max_pending` tâches
+    d'avance : `imap` consomme l'itérable d'entrée sans limite.
+    Les résultats sont rendus dans l'ordre d'entrée.
+    """
+    pending: deque = deque()
+    for item in items:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def run(path: str, out: TextIO, workers: int, depth: int, multipv: int = 1, variant: str = "classique") -> int:
+    get_variant(variant)  # nom invalide : erreur avant de lancer le pool
+    tasks = ((game, depth, multipv, variant) for game in read_games(path))
+    count = 0
+    with Pool(processes=workers) as pool:
+        for annotations in bounded_imap(pool, _analyse_task, tasks, max_pending=workers * 4):
+            for entry in annotations:
+                out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            out.flush()
+            count += 1
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Analyse hors-ligne de parties de dames.")
+    parser.add_argument("input", help="fichier de parties (.txt, .gz ou - pour stdin)")
+    parser.add_argument("-o", "--output", default="-", help="fichier JSONL de sortie (défaut : stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="nombre de processus")
+    parser.add_argument("--depth", type=int, default=3, help="profondeur de recherche en demi-coups")
+    parser.add_argument("--multipv", type=int, default=1, help="nombre de coups candidats classés par position")
+    parser.add_argument("--variante", default="classique", help="règles : classique, anglaise, bresilienne, internationale")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        count = run(args.input, out, max(1, args.jobs), max(1, args.depth), max(1, args.multipv), args.variante)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{count} parties analysées", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# analysis_cache.py : cache partagé des résultats de recherche de l'IA
+"""
+Service d'analyse partagé : les requêtes sont indexées par
+(hash de position, réglages de recherche). Deux demandes identiques en vol
+en même temps ne lancent qu'une seule recherche (coalescence), et les
+résultats sont gardés dans un cache LRU avec durée de vie (TTL) et plafonds
+d'entrées / de mémoire.
+
+Utilisable depuis des threads (`get_or_compute`, interface UI et outils
+hors-ligne) comme depuis asyncio (`get_or_compute_async`, serveur).
+"""
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class AnalysisCache:
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl: Optional[float] = 3600.0,
+        max_bytes: int = 32 * 1024 * 1024,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._inflight_async: Dict[Hashable, "asyncio.Future"] = {}
+        # appelé après chaque calcul frais (persistance, voir position_store.py)
+        self.on_computed: Optional[Callable[[Hashable, Any], None]] = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _size(key: Hashable, value: Any) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value) + 64
+
+    # --- Accès direct ---
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return self._get_locked(key)
+
+    def _get_locked(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, size, value = entry
+        if expires and expires < monotonic():
+            del self._entries[key]
+            self._bytes -= size
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._size(key, value)
+        expires = monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (expires, size, value)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, old_size, _) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # --- Calcul avec coalescence ---
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Any], keep: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Depuis n'importe quel thread : un seul calcul par clé en vol. Si
+        `keep(valeur)` est faux, le résultat est rendu sans être gardé (ni
+        cache, ni `on_computed`).
+        """
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                return value
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            if value is not None and (keep is None or keep(value)):
+                self.put(key, value)
+                if self.on_computed is not None:
+                    self.on_computed(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def get_or_compute_async(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]], keep: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """Variante asyncio (une seule boucle d'événements)."""
+        import asyncio  # import coûteux, inutile à l'interface Pygame
+
+        value = self.get(key)
+        if value is not None:
+            return value
+        future = self._inflight_async.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = self._inflight_async[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await compute()
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # marque l'exception comme consommée
+            raise
+        else:
+            if value is not None and (keep is None or keep(value)):
+                self.put(key, value)
+                if self.on_computed is not None:
+                    self.on_computed(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight_async[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
@@ -1,8 +1,14 @@
 import math
 import pygame
 
+from fonts import get_font
+
 
 class Animation:
+    # __slots__ partout : pas de dict par instance (une dizaine
+    # d'animations sont créées à chaque coup)
+    __slots__ = ("duration", "t", "finished")
+
     def __init__(self, duration: float):
         self.duration = duration
         self.t = 0.0
@@ -24,30 +30,43 @@ def _specular_color(is_night: bool):
     return (255, 255, 255, 70) if not is_night else (220, 220, 255, 50)
 
 
-def draw_piece_shape(
-    surface: pygame.Surface,
-    center,
-    piece_value: int,
-    cell_size: int,
-    colors,
-    is_night: bool,
-    font,
-):
-    cx, cy = center
+# Calques de pièces déjà rendus : (pièce, taille, couleurs, nuit, police) -> calques
+_piece_sprites = {}
+MAX_PIECE_SPRITES = 64
+
+
+def piece_sprite(piece_value: int, cell_size: int, colors, is_night: bool, font):
+    """
+    Calques (surface, décalage depuis le coin de la case) d'une pièce :
+    ombre, corps, puis couronne pour une dame. Rendus une fois ; blittés
+    l'un après l'autre, ils donnent les mêmes pixels qu'un dessin direct.
+    """
     base_col = colors["piece_white"] if piece_value > 0 else colors["piece_black"]
+    key = (piece_value, cell_size, base_col, colors["crown"], is_night, font)
+    sprite = _piece_sprites.get(key)
+    if sprite is None:
+        if len(_piece_sprites) >= MAX_PIECE_SPRITES:
+            _piece_sprites.clear()
+        sprite = _piece_sprites[key] = _render_piece(piece_value, cell_size, base_col, colors["crown"], is_night, font)
+    return sprite
+
+
+def _render_piece(piece_value: int, cell_size: int, base_col, crown_col, is_night: bool, font):
+    # cotes proportionnelles à la case (valeurs entières du dessin d'origine en 80 px)
+    half = cell_size // 2
+    radius = cell_size * 3 // 10
 
     # Shadow
     shadow = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
     pygame.draw.circle(
         shadow,
         (0, 0, 0, 120),
-        (cell_size // 2 + 3, cell_size // 2 + 5),
-        cell_size // 2 - 20,
+        (half + cell_size * 3 // 80, half + cell_size // 16),
+        cell_size // 4,
     )
-    surface.blit(shadow, (cx - cell_size // 2, cy - cell_size // 2))
 
     main = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
-    pygame.draw.circle(main, base_col, (cell_size // 2, cell_size // 2), cell_size // 2 - 16)
+    pygame.draw.circle(main, base_col, (half, half), radius)
 
     # texture douce
     texture = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
@@ -62,24 +81,43 @@ def draw_piece_shape(
     pygame.draw.ellipse(
         specular,
         _specular_color(is_night),
-        (cell_size // 2 - 16, cell_size // 2 - 26, 28, 14),
+        (radius, cell_size * 7 // 40, cell_size * 7 // 20, cell_size * 7 // 40),
     )
     specular = pygame.transform.rotate(specular, -25)
-    main.blit(specular, (-6, 0))
+    main.blit(specular, (-(cell_size * 3 // 40), 0))
 
     # anneaux
-    pygame.draw.circle(main, (0, 0, 0, 90), (cell_size // 2, cell_size // 2), cell_size // 2 - 16, 2)
-    pygame.draw.circle(main, (255, 255, 255, 50), (cell_size // 2, cell_size // 2), cell_size // 2 - 22, 1)
-
-    surface.blit(main, (cx - cell_size // 2, cy - cell_size // 2))
+    pygame.draw.circle(main, (0, 0, 0, 90), (half, half), radius, max(1, cell_size // 40))
+    pygame.draw.circle(main, (255, 255, 255, 50), (half, half), cell_size * 9 // 40, 1)
 
+    layers = [(shadow, (0, 0)), (main, (0, 0))]
     if abs(piece_value) == 2:
-        crown = font.render("♕", True, colors["crown"])
-        rect = crown.get_rect(center=(cx, cy))
-        surface.blit(crown, rect)
+        crown = font.render("♕", True, crown_col)
+        layers.append((crown, crown.get_rect(center=(half, half)).topleft))
+    return tuple(layers)
+
+
+def draw_piece_shape(
+    surface: pygame.Surface,
+    center,
+    piece_value: int,
+    cell_size: int,
+    colors,
+    is_night: bool,
+    font,
+):
+    x = center[0] - cell_size // 2
+    y = center[1] - cell_size // 2
+    for layer, (dx, dy) in piece_sprite(piece_value, cell_size, colors, is_night, font):
+        surface.blit(layer, (x + dx, y + dy))
 
 
 class MoveAnimation(Animation):
+    __slots__ = (
+        "start_cell", "end_cell", "cell_size", "offset_y", "theme_colors",
+        "is_night", "font", "start_pos", "end_pos", "piece_value",
+    )
+
     def __init__(
         self,
         start_cell,
@@ -132,113 +170,9 @@ class MoveAnimation(Animation):
         )
 
 
-class SelectPulseAnimation(Animation):
-    def __init__(self, cell, cell_size, offset_y, color, duration: float = 0.15):
-        super().__init__(duration)
-        self.cell = cell
-        self.cell_size = cell_size
-        self.offset_y = offset_y
-        self.color = color
-
-    def draw(self, screen):
-        p = self.progress()
-        scale = 1.0 + 0.1 * math.sin(p * math.pi)
-        r, c = self.cell
-        cx = c * self.cell_size + self.cell_size // 2
-        cy = self.offset_y + r * self.cell_size + self.cell_size // 2
-        radius = int((self.cell_size // 2 - 10) * scale)
-        surface = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
-        pygame.draw.circle(surface, (*self.color, 60), (self.cell_size // 2, self.cell_size // 2), radius, 3)
-        screen.blit(surface, (c * self.cell_size, self.offset_y + r * self.cell_size))
-
-
-class CapturePulseAnimation(Animation):
-    def __init__(self, cell, cell_size, offset_y, color, duration: float = 1.2):
-        super().__init__(duration)
-        self.cell = cell
-        self.cell_size = cell_size
-        self.offset_y = offset_y
-        self.color = color
-
-    def update(self, dt: float):
-        # boucle continue tant que présente dans la liste
-        if self.finished:
-            return
-        self.t = (self.t + dt) % self.duration
-
-    def draw(self, screen):
-        p = self.progress()
-        pulse = 0.6 + 0.4 * math.sin(p * math.pi * 2)
-        alpha = int(70 + 50 * pulse)
-        radius = int((self.cell_size // 2 - 8) * (0.8 + 0.2 * pulse))
-        r, c = self.cell
-        cx = c * self.cell_size + self.cell_size // 2
-        cy = self.offset_y + r * self.cell_size + self.cell_size // 2
-        surf = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
-        pygame.draw.circle(surf, (*self.color, alpha), (self.cell_size // 2, self.cell_size // 2), radius, 2)
-        screen.blit(surf, (c * self.cell_size, self.offset_y + r * self.cell_size))
-
-
-class LastMoveFadeAnimation(Animation):
-    def __init__(self, cells, duration: float = 0.4):
-        super().__init__(duration)
-        self.cells = cells
-
-    def draw(self, screen):
-        alpha = int(90 * (1 - self.progress()))
-        if alpha <= 0:
-            return
-        for (x, y, size) in self.cells:
-            surf = pygame.Surface((size, size), pygame.SRCALPHA)
-            pygame.draw.rect(surf, (0, 150, 255, alpha), (4, 4, size - 8, size - 8), border_radius=8)
-            screen.blit(surf, (x, y))
-
-
-class PromotionGlowAnimation(Animation):
-    def __init__(self, cell, cell_size, offset_y, color, duration: float = 0.3):
-        super().__init__(duration)
-        self.cell = cell
-        self.cell_size = cell_size
-        self.offset_y = offset_y
-        self.color = color
-
-    def draw(self, screen):
-        p = self.progress()
-        r, c = self.cell
-        cx = c * self.cell_size + self.cell_size // 2
-        cy = self.offset_y + r * self.cell_size + self.cell_size // 2
-        radius = int((self.cell_size // 2) * (0.5 + 0.7 * p))
-        alpha = int(160 * (1 - p))
-        surf = pygame.Surface((self.cell_size * 2, self.cell_size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(
-            surf,
-            (*self.color, alpha),
-            (self.cell_size, self.cell_size),
-            radius,
-            4,
-        )
-        screen.blit(surf, (cx - self.cell_size, cy - self.cell_size))
-
-
-class ShakeAnimation(Animation):
-    def __init__(self, cell, amplitude: int, duration: float = 0.12):
-        super().__init__(duration)
-        self.cell = cell
-        self.amplitude = amplitude
-
-    def offset(self):
-        p = self.progress()
-        return (
-            int(self.amplitude * math.sin(p * math.pi * 10)),
-            int(self.amplitude * 0.4 * math.sin(p * math.pi * 8)),
-        )
-
-    def draw(self, screen):
-        # le shake est appliqué via l'offset ; aucun dessin direct nécessaire
-        return
-
-
 class StartupFadeAnimation(Animation):
+    __slots__ = ()
+
     def __init__(self, duration: float = 0.4):
         super().__init__(duration)
 
@@ -261,13 +195,22 @@ class StartupFadeAnimation(Animation):
 
 
 class EndGameAnimation(Animation):
-    def __init__(self, winner_text: str, screen_size, text_color, duration: float = 1.8):
+    __slots__ = ("winner_text", "screen_size", "text_color", "button_rect", "font_cache", "scale")
+
+    def __init__(self, winner_text: str, screen_size, text_color, duration: float = 1.8, scale: float = 1.0):
         super().__init__(duration)
         self.winner_text = winner_text
         self.screen_size = screen_size
         self.text_color = text_color
         self.button_rect = None
-        self.font_cache = pygame.font.SysFont("segoe ui", 26)
+        self.scale = scale
+        self.font_cache = get_font(round(26 * scale))
+
+    def resized(self, screen_size, scale: float) -> "EndGameAnimation":
+        """Même écran de fin, aux cotes d'une nouvelle taille de fenêtre."""
+        anim = EndGameAnimation(self.winner_text, screen_size, self.text_color, self.duration, scale)
+        anim.t = self.t
+        return anim
 
     def update(self, dt: float):
         # l'animation reste active pour conserver l'overlay
@@ -281,7 +224,7 @@ class EndGameAnimation(Animation):
         overlay.fill((0, 0, 0, int(160 * p)))
         screen.blit(overlay, (0, 0))
 
-        center = (w // 2, h // 2 - 20)
+        center = (w // 2, h // 2 - round(20 * self.scale))
         halo = pygame.Surface((w, h), pygame.SRCALPHA)
         pulse = 0.5 + 0.5 * math.sin(p * math.pi * 2)
         radius = int(min(w, h) * 0.22 * (0.9 + 0.2 * pulse))
@@ -292,9 +235,9 @@ class EndGameAnimation(Animation):
         title_rect = title.get_rect(center=center)
         screen.blit(title, title_rect)
 
-        btn_width, btn_height = 180, 42
+        btn_width, btn_height = round(180 * self.scale), round(42 * self.scale)
         self.button_rect = pygame.Rect(0, 0, btn_width, btn_height)
-        self.button_rect.center = (w // 2, h // 2 + 36)
+        self.button_rect.center = (w // 2, h // 2 + round(36 * self.scale))
         btn_surf = pygame.Surface((btn_width, btn_height), pygame.SRCALPHA)
         pygame.draw.rect(btn_surf, (*self.text_color, 40), btn_surf.get_rect(), border_radius=10)
         pygame.draw.rect(btn_surf, (*self.text_color, 90), btn_surf.get_rect(), 2, border_radius=10)
@@ -0,0 +1,223 @@
+# bench_engine.py : microbenchmarks des primitives du moteur, avec référence
+"""
+Mesure chaque primitive du moteur et de l'IA (ns par appel) sur un corpus
+reproductible : ouverture, milieu de partie, finale de dames et position
+riche en prises. Chaque mesure est la meilleure de `--repeat` passes sur
+toutes les entrées de la position (cases, pièces ou coups selon la
+primitive), comme `timeit`.
+
+    python3 bench_engine.py --save reference.json      # enregistre la référence
+    python3 bench_engine.py --compare reference.json    # compare à la référence
+
+En mode comparaison, toute mesure plus lente que la référence de plus de
+`--threshold` (15 % par défaut) est signalée, et le script sort avec le
+code 1 : chaque optimisation se mesure contre les mêmes chiffres.
+"""
+import argparse
+import json
+import random
+import sys
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ai import AI
+from bench_search import corpus
+from engine import Engine, Variant, color, get_captures, get_simple_moves, get_variant, inside, is_king, legal_moves
+
+# Mesure : (parcours de toutes les entrées, nombre d'entrées, préparation
+# hors chronomètre avant chaque parcours ou None)
+Bench = Tuple[Callable[[], None], int, Optional[Callable[[], None]]]
+
+
+def capture_position(variant: Optional[Variant] = None, seed: int = 7, games: int = 40) -> Engine:
+    """Position de parties aléatoires (graine fixe) où le camp au trait a le plus de prises."""
+    rng = random.Random(seed)
+    best: Optional[Engine] = None
+    best_count = 0
+    for _ in range(games):
+        engine = Engine(variant)
+        for _ in range(60):
+            moves = legal_moves(engine.board, engine.turn)
+            if not moves:
+                break
+            if moves[0].captures and len(moves) > best_count:
+                best_count = len(moves)
+                best = Engine(variant)
+                best.set_position(engine.board.grid, engine.turn)
+            engine.play(rng.choice(moves))
+    return best if best is not None else Engine(variant)
+
+
+def positions(variant: Optional[Variant] = None, seed: int = 7) -> Dict[str, Engine]:
+    engines = corpus(variant, seed)
+    engines["prises"] = capture_position(variant, seed)
+    return engines
+
+
+def primitives(engine: Engine) -> Dict[str, Bench]:
+    board = engine.board
+    size = board.size
+    cells = [board.grid[r][c] for r in range(size) for c in range(size)]
+    squares = [(r, c) for r in range(-1, size + 1) for c in range(-1, size + 1)]
+    own = sorted(board.pieces[engine.turn])
+    moves = sorted(legal_moves(board, engine.turn), key=lambda m: m.sort_key())
+    ai = AI(engine, level=3, seed=0)
+    ai.ai_color = engine.turn
+    children = [ai.apply_move_sim(board, move) for move in moves] or [board]
+    # coups joués par Engine.move_piece : un moteur neuf par coup, préparé hors mesure
+    played = [move.as_tuple() for move in moves]
+    grid, turn = board.grid, engine.turn
+
+    def run_color():
+        for piece in cells:
+            color(piece)
+
+    def run_is_king():
+        for piece in cells:
+            is_king(piece)
+
+    def run_inside():
+        for r, c in squares:
+            inside(r, c, size)
+
+    def run_get_captures():
+        for r, c in own:
+            get_captures(board, r, c)
+
+    def run_get_simple_moves():
+        for r, c in own:
+            get_simple_moves(board, r, c)
+
+    def run_clone():
+        for _ in own:
+            board.clone()
+
+    def run_apply_move_sim():
+        for move in moves:
+            ai.apply_move_sim(board, move)
+
+    def run_evaluate():
+        for child in children:
+            ai.evaluate(child)
+
+    return {
+        "color": (run_color, len(cells), None),
+        "is_king": (run_is_king, len(cells), None),
+        "inside": (run_inside, len(squares), None),
+        "get_captures": (run_get_captures, len(own), None),
+        "get_simple_moves": (run_get_simple_moves, len(own), None),
+        "Board.clone": (run_clone, len(own), None),
+        "Engine.move_piece": _move_piece_bench(engine.variant, grid, turn, played),
+        "AI.apply_move_sim": (run_apply_move_sim, len(moves), None),
+        "AI.evaluate": (run_evaluate, len(children), None),
+    }
+
+
+def _move_piece_bench(variant: Variant, grid, turn: int, played: List[Tuple[int, int, int, int]]) -> Bench:
+    engines: List[Engine] = []
+
+    def prepare():
+        engines.clear()
+        for _ in played:
+            engine = Engine(variant)
+            engine.set_position(grid, turn)
+            engines.append(engine)
+
+    def play():
+        for engine, move in zip(engines, played):
+            engine.move_piece(*move)
+
+    # `play` consomme les moteurs : ils sont refaits avant chaque parcours
+    return play, len(played), prepare
+
+
+def measure(bench: Bench, repeat: int, number: int) -> float:
+    """Meilleur temps par entrée (ns) sur `repeat` passes de `number` parcours."""
+    loop, count, prepare = bench
+    if count == 0:
+        return 0.0
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for _ in range(number):
+            if prepare is not None:
+                prepare()
+            start = perf_counter()
+            loop()
+            elapsed += perf_counter() - start
+        best = min(best, elapsed)
+    return best / (number * count) * 1e9
+
+
+def run(variant: Optional[Variant] = None, seed: int = 7, repeat: int = 5, number: int = 200) -> Dict[str, Dict[str, float]]:
+    """{primitive: {position: ns par appel}}."""
+    results: Dict[str, Dict[str, float]] = {}
+    for name, engine in positions(variant, seed).items():
+        for primitive, bench in primitives(engine).items():
+            results.setdefault(primitive, {})[name] = measure(bench, repeat, number)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], reference: Dict[str, Dict[str, float]], threshold: float
+) -> List[Tuple[str, str, float, float]]:
+    """Mesures plus lentes que la référence de plus de `threshold` : (primitive, position, réf., actuel)."""
+    regressions = []
+    for primitive, by_position in results.items():
+        for name, ns in by_position.items():
+            ref = reference.get(primitive, {}).get(name)
+            if ref and ns > ref * (1 + threshold):
+                regressions.append((primitive, name, ref, ns))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmarks des primitives du moteur.")
+    parser.add_argument("--variante", default="classique", help="règles : classique, anglaise, bresilienne, internationale")
+    parser.add_argument("--seed", type=int, default=7, help="graine du corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="passes (la meilleure est gardée)")
+    parser.add_argument("--number", type=int, default=200, help="parcours des entrées par passe")
+    parser.add_argument("--save", help="écrit les résultats comme référence dans ce fichier JSON")
+    parser.add_argument("--compare", help="compare à la référence de ce fichier JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="ralentissement toléré (0.15 = 15 %%)")
+    args = parser.parse_args(argv)
+
+    variant = get_variant(args.variante)
+    reference: Optional[Dict[str, Any]] = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            reference = json.load(f)
+        if (reference.get("variant"), reference.get("seed")) != (variant.name, args.seed):
+            print(
+                f"attention : référence mesurée en {reference.get('variant')} graine {reference.get('seed')}, "
+                f"mesure en {variant.name} graine {args.seed}"
+            )
+
+    results = run(variant, args.seed, args.repeat, args.number)
+    names = list(next(iter(results.values())))
+    print(f"graine {args.seed}, ns par appel")
+    print(f"{'primitive':<20}" + "".join(f"{name:>14}" for name in names))
+    for primitive, by_position in results.items():
+        row = f"{primitive:<20}"
+        for name in names:
+            ns = by_position[name]
+            ref = reference["results"].get(primitive, {}).get(name) if reference else None
+            row += f"{ns:>8.0f} {(ns / ref - 1) * 100:+4.0f}%" if ref else f"{ns:>14.0f}"
+        print(row)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"variant": variant.name, "seed": args.seed, "results": results}, f, indent=2)
+        print(f"référence écrite dans {args.save}")
+
+    if reference is not None:
+        regressions = compare(results, reference["results"], args.threshold)
+        for primitive, name, ref, ns in regressions:
+            print(f"RÉGRESSION {primitive} / {name} : {ref:.0f} -> {ns:.0f} ns (+{(ns / ref - 1) * 100:.0f} %)")
+        if regressions:
+            sys.exit(1)
+        print(f"aucune régression au-delà de {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# bench_render.py : benchmark du rendu Pygame sans fenêtre
+"""
+Mesure le coût du rendu sur une surface hors-écran, avec le driver vidéo
+SDL « dummy » : aucun écran n'est nécessaire (machines de CI).
+
+Chaque scénario dessine `--frames` frames et rapporte le temps moyen par
+frame, les allocations Python (tracemalloc) par frame et le nombre de
+`pygame.Surface` construites par frame (la mémoire pixel des surfaces est
+allouée par SDL et échappe à tracemalloc).
+
+    python3 bench_render.py
+    python3 bench_render.py --frames 500 --scenario nuit --json bench.json
+    DAMES_VARIANTE=internationale python3 bench_render.py   # plateau 10x10
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import tracemalloc
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+import pygame
+
+import main as game
+from animation import EndGameAnimation, MoveAnimation, StartupFadeAnimation, draw_piece_shape
+from effects import (
+    CAPTURE_PULSE,
+    HINT_HALO,
+    HINT_TARGET_RING,
+    LAST_MOVE,
+    PROMOTION_GLOW,
+    SELECT_PULSE,
+    SHAKE,
+    EffectLayer,
+    EffectSpec,
+)
+from engine import Engine
+from theme import DAY, NIGHT
+from tutorial import Tutorial
+
+FRAME_DT = 1.0 / game.FPS
+
+_surface_count = 0
+
+
+class _CountingSurface(pygame.Surface):
+    def __init__(self, *args, **kwargs):
+        global _surface_count
+        _surface_count += 1
+        super().__init__(*args, **kwargs)
+
+
+Frame = Callable[[], None]
+
+
+def _dark_cells():
+    size = game.BOARD_SIZE
+    return [(r, c) for r in range(size) for c in range(size) if (r + c) % 2 == 1]
+
+
+def _board_frame(screen, font, engine: Engine, theme, effects: Optional[EffectLayer] = None, hint=None) -> Frame:
+    effects = effects if effects is not None else EffectLayer()
+
+    def frame():
+        game.current_theme = theme
+        if hint is not None and not effects.active(HINT_HALO):
+            effects.add(HINT_HALO, (hint.r, hint.c), game.HINT_SOURCE)
+            effects.add(HINT_TARGET_RING, (hint.r2, hint.c2), game.HINT_TARGET)
+        effects.advance(FRAME_DT)
+        game.draw_board(
+            screen, engine, None, [], hint, font,
+            12.0, 34.0, [], set(), effects,
+        )
+
+    return frame
+
+
+def _kings_engine() -> Engine:
+    engine = Engine(game.VARIANT)
+    for r, c in _dark_cells():
+        engine.board.grid[r][c] = 2 if r >= game.BOARD_SIZE // 2 else -2
+    engine.board.sync()
+    return engine
+
+
+def _animation_frame(screen, font, make_anim) -> Frame:
+    state = {"anim": make_anim()}
+
+    def frame():
+        anim = state["anim"]
+        anim.update(FRAME_DT)
+        if anim.finished:
+            anim = state["anim"] = make_anim()
+        screen.fill(DAY["bg"])
+        anim.draw(screen)
+
+    return frame
+
+
+def _effect_frame(screen, spec: EffectSpec, cells, color) -> Frame:
+    """Un effet relancé dès qu'il se termine, seul sur le fond."""
+    effects = EffectLayer()
+
+    def frame():
+        effects.advance(FRAME_DT)
+        if not effects.active(spec):
+            for cell in cells:
+                effects.add(spec, cell, color)
+        screen.fill(DAY["bg"])
+        effects.draw(screen, game.CELL, game.OFFSET_Y, game.UI_SCALE)
+
+    return frame
+
+
+def build_scenarios(screen, font) -> Dict[str, Frame]:
+    cell, off = game.CELL, game.OFFSET_Y
+    size = (game.WIDTH, game.HEIGHT)
+    tutorial = Tutorial()
+    tutorial.start()
+    colors = {"piece_white": DAY["piece_white"], "piece_black": DAY["piece_black"], "crown": DAY["crown"]}
+
+    def pieces_frame():
+        screen.fill(DAY["bg"])
+        for r, c in _dark_cells():
+            value = (1, -1, 2, -2)[(r * game.BOARD_SIZE + c) % 4]
+            draw_piece_shape(screen, (c * cell + cell // 2, off + r * cell + cell // 2), value, cell, colors, False, font)
+
+    capture_pulses = EffectLayer()
+    capture_pulses.set_cells(CAPTURE_PULSE, _dark_cells(), game.CAPTURE_PULSE_COLOR)
+
+    def tutorial_frame():
+        tutorial.draw(screen, font, DAY)
+
+    return {
+        "plateau_complet": _board_frame(screen, font, Engine(game.VARIANT), DAY),
+        "dames_partout": _board_frame(screen, font, _kings_engine(), DAY),
+        "pulses": _board_frame(screen, font, Engine(game.VARIANT), DAY, capture_pulses),
+        "nuit": _board_frame(screen, font, Engine(game.VARIANT), NIGHT),
+        "hint": _board_frame(screen, font, Engine(game.VARIANT), DAY, hint=Engine(game.VARIANT).get_hint()),
+        "draw_piece_shape": pieces_frame,
+        "tutorial": tutorial_frame,
+        "anim_move": _animation_frame(
+            screen, font, lambda: MoveAnimation((0, 5), (1, 4), 1, cell, off, DAY, False, font)
+        ),
+        "anim_select_pulse": _effect_frame(screen, SELECT_PULSE, [(5, 0)], DAY["text"]),
+        "anim_capture_pulse": _effect_frame(screen, CAPTURE_PULSE, [(5, 0)], game.CAPTURE_PULSE_COLOR),
+        "anim_last_move": _effect_frame(screen, LAST_MOVE, [(5, 0), (4, 1)], game.LAST_MOVE_COLOR),
+        "anim_promotion": _effect_frame(screen, PROMOTION_GLOW, [(0, 1)], DAY["crown"]),
+        "anim_shake": _effect_frame(screen, SHAKE, [(5, 0)], (0, 0, 0)),
+        "anim_startup": _animation_frame(screen, font, lambda: StartupFadeAnimation()),
+        "anim_endgame": _animation_frame(
+            screen, font, lambda: EndGameAnimation("Victoire des Blancs", size, DAY["text"])
+        ),
+    }
+
+
+def run_scenario(frame: Frame, frames: int, warmup: int = 10) -> Dict[str, float]:
+    global _surface_count
+    for _ in range(warmup):
+        frame()
+
+    _surface_count = 0
+    start = perf_counter()
+    for _ in range(frames):
+        frame()
+    elapsed = perf_counter() - start
+    surfaces = _surface_count
+
+    # second passage sous tracemalloc (qui ralentit) pour les allocations
+    tracemalloc.start()
+    alloc_total = 0
+    for _ in range(frames):
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        frame()
+        _, peak = tracemalloc.get_traced_memory()
+        alloc_total += peak - base
+    tracemalloc.stop()
+
+    return {
+        "ms_per_frame": elapsed * 1000 / frames,
+        "alloc_kib_per_frame": alloc_total / 1024 / frames,
+        "surfaces_per_frame": surfaces / frames,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark du rendu Pygame sans fenêtre.")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--scenario", action="append", help="scénario à lancer (répétable, défaut : tous)")
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier JSON")
+    args = parser.parse_args(argv)
+
+    game.apply_layout()
+    pygame.init()
+    pygame.display.set_mode((game.WIDTH, game.HEIGHT))
+    screen = pygame.Surface((game.WIDTH, game.HEIGHT))
+    pygame.Surface = _CountingSurface
+    font = pygame.font.Font(None, 20)  # police par défaut : identique sur toutes les machines
+
+    scenarios = build_scenarios(screen, font)
+    names = args.scenario or list(scenarios)
+    results: Dict[str, Dict[str, float]] = {}
+
+    print(f"{'scénario':<20} {'ms/frame':>10} {'Ko alloués/frame':>18} {'surfaces/frame':>15}")
+    for name in names:
+        if name not in scenarios:
+            parser.error(f"scénario inconnu : {name} (choix : {', '.join(scenarios)})")
+        res = run_scenario(scenarios[name], args.frames)
+        results[name] = res
+        print(
+            f"{name:<20} {res['ms_per_frame']:>10.3f} {res['alloc_kib_per_frame']:>18.2f} "
+            f"{res['surfaces_per_frame']:>15.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"frames": args.frames, "results": results}, f, indent=2)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
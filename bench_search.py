@@ -0,0 +1,145 @@
+# bench_search.py : coût en temps et en mémoire d'une recherche de l'IA
+"""
+Lance `AI.search` à profondeur fixe sur un petit corpus de positions
+reproductibles et rapporte le temps, les nœuds visités, le pic de mémoire
+Python (tracemalloc) et le nombre de passages du GC cyclique de chaque
+recherche, ainsi que le coût de la génération de coups rapporté au nombre
+de pièces (µs par case occupée) : il doit rester du même ordre sur le
+plateau 10x10 que sur le 8x8.
+
+    python3 bench_search.py --depth 5
+    python3 bench_search.py --depth 3 --variante internationale
+    python3 bench_search.py --depth 5 --sans-pool   # un plateau neuf par nœud, GC actif
+
+À graine égale (`--seed`, enregistrée dans le JSON), nœuds et coups choisis
+sont identiques d'une exécution à l'autre ; seuls les temps varient.
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from ai import AI
+from engine import Engine, Variant, get_variant, legal_moves
+
+
+def play_random(engine: Engine, plies: int, seed: int) -> Engine:
+    """Joue `plies` coups aléatoires (graine fixe) via l'API publique d'Engine."""
+    rng = random.Random(seed)
+    size = len(engine.board.grid)
+    for _ in range(plies):
+        choices = [
+            (r, c, r2, c2)
+            for r in range(size)
+            for c in range(size)
+            for r2, c2 in engine.get_legal_moves(r, c)
+        ]
+        if not choices:
+            break
+        engine.move_piece(*rng.choice(choices))
+    return engine
+
+
+def corpus(variant: Optional[Variant] = None, seed: int = 7) -> Dict[str, Engine]:
+    kings = Engine(variant)
+    grid = kings.board.grid
+    for r, row in enumerate(grid):
+        for c in range(len(row)):
+            row[c] = 0
+    # cases valides sur 8x8 comme sur 10x10
+    for r, c, piece in ((7, 0, 2), (5, 2, 2), (6, 5, 1), (0, 1, -2), (1, 4, -2), (2, 7, -1)):
+        grid[r][c] = piece
+    kings.set_position(grid, 1)
+    return {
+        "ouverture": Engine(variant),
+        "milieu": play_random(Engine(variant), 16, seed=seed),
+        "finale_dames": kings,
+    }
+
+
+def movegen_us_per_square(engine: Engine, repeat: int = 2000) -> float:
+    """Temps de génération des coups légaux des deux camps, par pièce présente."""
+    board = engine.board
+    squares = len(board.pieces[1]) + len(board.pieces[-1])
+    start = perf_counter()
+    for _ in range(repeat):
+        legal_moves(board, 1)
+        legal_moves(board, -1)
+    return (perf_counter() - start) / repeat / max(1, squares) * 1e6
+
+
+def run(
+    depth: int, variant: Optional[Variant] = None, seed: int = 7, memory_bounded: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, engine in corpus(variant, seed).items():
+        ai = AI(engine, level=3, seed=seed, memory_bounded=memory_bounded)
+        # générations vidées avant la mesure : les déchets du corpus ne sont
+        # pas collectés au compte de la recherche
+        gc.collect()
+        start = perf_counter()
+        move, score = ai.search(depth)
+        elapsed = perf_counter() - start
+        collections = ai.last_gc_collections
+
+        ai.collect_stats = True
+        ai.search(depth)
+        nodes = ai.last_stats.nodes + ai.last_stats.qnodes
+        ai.collect_stats = False
+
+        tracemalloc.start()
+        ai.search(depth)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[name] = {
+            "ms": elapsed * 1000,
+            "nodes": nodes,
+            "knodes_per_s": nodes / elapsed / 1000 if elapsed else 0.0,
+            "peak_kib": peak / 1024,
+            "gc": collections,
+            "movegen_us_per_square": movegen_us_per_square(engine),
+            "move": str(move),
+            "score": score,
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark temps / mémoire de la recherche.")
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--variante", default="classique", help="règles : classique, anglaise, bresilienne, internationale")
+    parser.add_argument("--seed", type=int, default=7, help="graine du corpus et de l'IA")
+    parser.add_argument("--sans-pool", action="store_true", help="sans le mode mémoire bornée (pool, GC suspendu)")
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier JSON")
+    args = parser.parse_args(argv)
+
+    variant = get_variant(args.variante)
+    results = run(args.depth, variant, args.seed, memory_bounded=not args.sans_pool)
+    print(f"graine {args.seed}")
+    print(f"{'position':<14} {'ms':>9} {'noeuds':>9} {'knoeuds/s':>10} {'pic Kio':>9} {'GC':>4} {'µs/case':>8}  coup")
+    for name, res in results.items():
+        print(
+            f"{name:<14} {res['ms']:>9.1f} {res['nodes']:>9} {res['knodes_per_s']:>10.1f} "
+            f"{res['peak_kib']:>9.1f} {res['gc']:>4} {res['movegen_us_per_square']:>8.2f}  {res['move']}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "depth": args.depth,
+                    "variant": variant.name,
+                    "seed": args.seed,
+                    "memory_bounded": not args.sans_pool,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_startup.py : temps de démarrage (imports et premier frame)
+"""
+Chaque mesure est faite dans un interpréteur neuf (démarrage à froid) :
+
+- `engine+ai` : import du moteur et de l'IA, Pygame interdit (doit réussir) ;
+- `main` : import de main.py ;
+- `premier frame` : lancement complet jusqu'au premier `display.flip()`,
+  avec le driver vidéo SDL « dummy ».
+
+    python3 bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS: Dict[str, str] = {
+    "engine+ai": (
+        "import sys, time; sys.modules['pygame'] = None; t = time.perf_counter(); "
+        "import engine, ai; print(time.perf_counter() - t)"
+    ),
+    "main": "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)",
+    "premier frame": (
+        "import time; t = time.perf_counter(); import main; main.main(max_frames=1); "
+        "print(time.perf_counter() - t)"
+    ),
+}
+
+
+def measure(code: str) -> float:
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=HERE,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage à froid.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier JSON")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'étape':<16} {'médiane ms':>12} {'min ms':>10}")
+    for name, code in SCENARIOS.items():
+        try:
+            samples = [measure(code) * 1000 for _ in range(args.runs)]
+        except subprocess.CalledProcessError as exc:
+            print(f"{name:<16} échec : {exc.stderr.strip().splitlines()[-1]}")
+            continue
+        results[name] = {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+        print(f"{name:<16} {results[name]['median_ms']:>12.1f} {results[name]['min_ms']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"runs": args.runs, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
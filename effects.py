@@ -0,0 +1,228 @@
+# effects.py : effets de case déclaratifs (pulses, fondus, secousses, conseil)
+"""
+Un effet est une simple donnée : (type, case, instant de départ, couleur).
+Le type (`EffectSpec`, défini une fois ci-dessous) décrit la forme, la
+durée et les courbes de taille et d'opacité ; la valeur à un instant donné
+se calcule depuis l'horloge commune de la couche (`EffectLayer.clock`).
+
+Aucun objet n'est créé ni détruit frame par frame :
+
+- les pulses de prise sont déclarés chaque frame (`set_cells`) et ne sont
+  reconstruits que si l'ensemble des cases change ;
+- un clic ajoute un tuple, retiré quand sa durée est écoulée ;
+- le rendu est une seule passe de blits de sprites mis en cache par
+  (forme, rayon, épaisseur, couleur), l'opacité passant par `set_alpha`.
+
+Les cotes sont relatives à la case : les effets survivent à un
+redimensionnement de la fenêtre. `drawn` et `rendered` comptent les effets
+dessinés à la dernière frame et les sprites rendus depuis le début (voir
+aussi l'étape « effects » du profiler et bench_render.py).
+"""
+import math
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+Cell = Tuple[int, int]
+Color = Tuple[int, int, int]
+# courbe : (progression 0-1 de l'effet, horloge commune en s) -> valeur
+Curve = Callable[[float, float], float]
+
+RING = "anneau"
+RECT = "case"
+SHAKE_SHAPE = "secousse"
+
+# Sprites gardés en cache au plus
+MAX_SPRITES = 256
+
+
+class EffectSpec:
+    __slots__ = ("name", "shape", "duration", "loop", "radius", "width", "size_curve", "alpha_curve")
+
+    def __init__(
+        self,
+        name: str,
+        shape: str,
+        duration: float,
+        alpha_curve: Curve,
+        size_curve: Optional[Curve] = None,
+        radius: float = 0.0,
+        width: int = 1,
+        loop: bool = False,
+    ) -> None:
+        self.name = name
+        self.shape = shape
+        self.duration = duration
+        self.loop = loop
+        self.radius = radius  # fraction de la case
+        self.width = width  # épaisseur en pixels du gabarit 640
+        self.size_curve = size_curve
+        self.alpha_curve = alpha_curve
+
+    def progress(self, elapsed: float) -> float:
+        if self.loop:
+            return (elapsed % self.duration) / self.duration
+        return min(1.0, elapsed / self.duration)
+
+
+def _breathe(p: float) -> float:
+    return 0.6 + 0.4 * math.sin(p * math.pi * 2)
+
+
+def _hint_pulse(t: float) -> float:
+    return 0.5 + 0.5 * math.sin(4 * t)
+
+
+# Conseil : intensité 255 qui s'éteint à 120 par seconde
+HINT_DURATION = 255 / 120
+
+SELECT_PULSE = EffectSpec(
+    "selection", RING, 0.15, lambda p, t: 60, lambda p, t: 1.0 + 0.1 * math.sin(p * math.pi), radius=3 / 8, width=3
+)
+CAPTURE_PULSE = EffectSpec(
+    "prise", RING, 1.2, lambda p, t: 70 + 50 * _breathe(p), lambda p, t: 0.8 + 0.2 * _breathe(p),
+    radius=2 / 5, width=2, loop=True,
+)
+PROMOTION_GLOW = EffectSpec(
+    "promotion", RING, 0.3, lambda p, t: 160 * (1 - p), lambda p, t: 0.5 + 0.7 * p, radius=1 / 2, width=4
+)
+LAST_MOVE = EffectSpec("dernier_coup", RECT, 0.4, lambda p, t: 90 * (1 - p))
+SHAKE = EffectSpec("secousse", SHAKE_SHAPE, 0.12, lambda p, t: 0.0, radius=4 / 80)
+HINT_HALO = EffectSpec(
+    "conseil", RING, HINT_DURATION, lambda p, t: 255 * (1 - p) * (0.7 + 0.3 * _hint_pulse(t)),
+    radius=34 / 80, width=3,
+)
+HINT_TARGET_RING = EffectSpec(
+    "conseil_cible", RING, HINT_DURATION, lambda p, t: 255 * (1 - p) * (0.5 + 0.5 * _hint_pulse(t)),
+    radius=15 / 80, width=3,
+)
+
+Effect = Tuple[EffectSpec, Cell, float, Color]
+
+
+class EffectLayer:
+    def __init__(self) -> None:
+        self.clock = 0.0
+        self._effects: List[Effect] = []
+        self._sprites: Dict[Hashable, pygame.Surface] = {}
+        self._cells: Dict[EffectSpec, Tuple[Tuple[Cell, ...], Color]] = {}
+        self._no_offsets: Dict[Cell, Tuple[int, int]] = {}
+        self.drawn = 0
+        self.rendered = 0
+
+    # Déclaration
+    def add(self, spec: EffectSpec, cell: Cell, color: Color = (0, 0, 0)) -> None:
+        self._effects.append((spec, cell, self.clock, color))
+
+    def set_cells(self, spec: EffectSpec, cells: List[Cell], color: Color) -> None:
+        """Effets en boucle présents exactement sur `cells` (à appeler chaque frame)."""
+        key = (tuple(cells), color)
+        if self._cells.get(spec) == key:
+            return
+        self._cells[spec] = key
+        # les cases déjà présentes gardent leur phase
+        starts = {e[1]: e[2] for e in self._effects if e[0] is spec}
+        self._effects = [e for e in self._effects if e[0] is not spec]
+        self._effects.extend((spec, cell, starts.get(cell, self.clock), color) for cell in cells)
+
+    def replace(self, spec: EffectSpec, cell: Cell) -> None:
+        """Déplace l'effet `spec` sur `cell` sans le relancer."""
+        for i, (s, _, start, color) in enumerate(self._effects):
+            if s is spec:
+                self._effects[i] = (s, cell, start, color)
+
+    def clear(self, *specs: EffectSpec) -> None:
+        """Retire les effets des types `specs` (tous si aucun)."""
+        if specs:
+            self._effects = [e for e in self._effects if e[0] not in specs]
+            for spec in specs:
+                self._cells.pop(spec, None)
+        else:
+            self._effects = []
+            self._cells.clear()
+
+    def active(self, spec: EffectSpec) -> bool:
+        return any(e[0] is spec for e in self._effects)
+
+    # Horloge
+    def advance(self, dt: float) -> None:
+        self.clock += dt
+        clock = self.clock
+        for spec, _, start, _ in self._effects:
+            if not spec.loop and clock - start >= spec.duration:
+                self._effects = [e for e in self._effects if e[0].loop or clock - e[2] < e[0].duration]
+                break
+
+    def offsets(self, cell_size: int) -> Dict[Cell, Tuple[int, int]]:
+        """Décalages (dx, dy) en pixels des pièces secouées."""
+        shakes = [e for e in self._effects if e[0].shape == SHAKE_SHAPE]
+        if not shakes:
+            return self._no_offsets
+        return {cell: self._shake_offset(spec, start, cell_size) for spec, cell, start, _ in shakes}
+
+    def _shake_offset(self, spec: EffectSpec, start: float, cell_size: int) -> Tuple[int, int]:
+        p = spec.progress(self.clock - start)
+        amplitude = spec.radius * cell_size
+        return (
+            int(amplitude * math.sin(p * math.pi * 10)),
+            int(amplitude * 0.4 * math.sin(p * math.pi * 8)),
+        )
+
+    # Rendu
+    def draw(self, screen: pygame.Surface, cell_size: int, offset_y: int, scale: float = 1.0) -> None:
+        """Tous les effets visibles, en une passe."""
+        clock = self.clock
+        drawn = 0
+        for spec, (r, c), start, color in self._effects:
+            shape = spec.shape
+            if shape == SHAKE_SHAPE:
+                continue
+            p = spec.progress(clock - start)
+            alpha = int(spec.alpha_curve(p, clock))
+            if alpha <= 0:
+                continue
+            x = c * cell_size
+            y = offset_y + r * cell_size
+            if shape == RING:
+                radius = int(cell_size * spec.radius * (spec.size_curve(p, clock) if spec.size_curve else 1.0))
+                width = max(1, round(spec.width * scale))
+                sprite = self._ring(radius, width, color)
+                half = cell_size // 2
+                x += half - radius - 1
+                y += half - radius - 1
+            else:
+                sprite = self._rect(cell_size, color)
+            sprite.set_alpha(alpha)
+            screen.blit(sprite, (x, y))
+            drawn += 1
+        self.drawn = drawn
+
+    def _store(self, key: Hashable, sprite: pygame.Surface) -> pygame.Surface:
+        if len(self._sprites) >= MAX_SPRITES:
+            self._sprites.clear()
+        self._sprites[key] = sprite
+        self.rendered += 1
+        return sprite
+
+    def _ring(self, radius: int, width: int, color: Color) -> pygame.Surface:
+        key = (RING, radius, width, color)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            size = 2 * radius + 2
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, 255), (radius + 1, radius + 1), radius, width)
+            sprite = self._store(key, sprite)
+        return sprite
+
+    def _rect(self, cell_size: int, color: Color) -> pygame.Surface:
+        key = (RECT, cell_size, color)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
+            inset = cell_size // 20
+            pygame.draw.rect(
+                sprite, (*color, 255), (inset, inset, cell_size - 2 * inset, cell_size - 2 * inset),
+                border_radius=cell_size // 10,
+            )
+            sprite = self._store(key, sprite)
+        return sprite
@@ -1,5 +1,5 @@
-import copy
-from typing import List, Optional, Tuple
+import random
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 # Representation des pieces :
 # 0 = vide
@@ -8,7 +8,7 @@ from typing import List, Optional, Tuple
 
 
 Position = Tuple[int, int]
-CaptureMove = Tuple[int, int, int, int]
+MoveTuple = Tuple[int, int, int, int]
 
 
 def color(piece: int) -> int:
@@ -25,27 +25,215 @@ def is_king(piece: int) -> bool:
 
 
 class Board:
-    def __init__(self) -> None:
-        self.grid: List[List[int]] = [[0 for _ in range(8)] for _ in range(8)]
+    """
+    Grille `size` x `size` (selon la variante) plus, tenues à jour à chaque
+    coup, les cases occupées par camp (`pieces[1]`, `pieces[-1]`), le
+    matériel (`men`, `kings`), le hash de Zobrist des pièces (`hash`) et le
+    nombre de demi-coups sans prise ni mouvement de pion (`quiet_plies`) :
+    les parcours ne touchent que les pièces présentes.
+    Après une modification directe de `grid`, appeler `sync()`.
+    """
+
+    def __init__(self, variant: Optional["Variant"] = None) -> None:
+        self.variant: Variant = variant if variant is not None else CLASSIC
+        self.size = self.variant.size
+        self.grid: List[List[int]] = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        self.pieces: Dict[int, Set[Position]] = {1: set(), -1: set()}
+        self.men: Dict[int, int] = {1: 0, -1: 0}
+        self.kings: Dict[int, int] = {1: 0, -1: 0}
+        self.hash = 0
+        self.quiet_plies = 0
+        # état d'un évaluateur incrémental (ex. accumulateur du réseau, nnue.py)
+        self.accumulator = None
         self.reset()
 
     def reset(self) -> None:
-        for r in range(8):
-            for c in range(8):
+        size, rows = self.size, self.variant.rows
+        for r in range(size):
+            for c in range(size):
                 if (r + c) % 2 == 0:
                     self.grid[r][c] = 0
-                elif r < 3:
+                elif r < rows:
                     self.grid[r][c] = -1
-                elif r > 4:
+                elif r >= size - rows:
                     self.grid[r][c] = 1
                 else:
                     self.grid[r][c] = 0
+        self.sync()
+
+    def sync(self) -> None:
+        """Recalcule listes de pièces, compteurs et hash depuis `grid` (historique perdu)."""
+        self.accumulator = None
+        self.pieces = {1: set(), -1: set()}
+        self.men = {1: 0, -1: 0}
+        self.kings = {1: 0, -1: 0}
+        self.hash = 0
+        self.quiet_plies = 0
+        for r, row in enumerate(self.grid):
+            for c, piece in enumerate(row):
+                if piece:
+                    col = color(piece)
+                    self.pieces[col].add((r, c))
+                    self.hash ^= ZOBRIST[piece][r][c]
+                    if is_king(piece):
+                        self.kings[col] += 1
+                    else:
+                        self.men[col] += 1
+
+    def set_grid(self, grid: List[List[int]]) -> None:
+        """Remplace la position (copie de `grid`, ex. reçue d'un autre processus)."""
+        if len(grid) != self.size:
+            raise ValueError(f"Grille {len(grid)}x{len(grid)} pour la variante {self.variant.name}")
+        self.grid = [row[:] for row in grid]
+        self.sync()
+
+    def material(self, col: int) -> Tuple[int, int]:
+        """(pions, dames) du camp `col`."""
+        return self.men[col], self.kings[col]
 
     def clone(self) -> "Board":
-        new_board = Board()
-        new_board.grid = copy.deepcopy(self.grid)
+        new_board = Board.__new__(Board)
+        new_board.variant = self.variant
+        new_board.size = self.size
+        new_board.grid = [row[:] for row in self.grid]
+        new_board.pieces = {1: set(self.pieces[1]), -1: set(self.pieces[-1])}
+        new_board.men = dict(self.men)
+        new_board.kings = dict(self.kings)
+        new_board.hash = self.hash
+        new_board.quiet_plies = self.quiet_plies
+        new_board.accumulator = None
         return new_board
 
+    def copy_from(self, other: "Board") -> None:
+        """Recopie `other` sur place : aucun nouvel objet (plateaux réutilisés par la recherche)."""
+        if self.size != other.size:
+            self.grid = [row[:] for row in other.grid]
+        else:
+            for row, source in zip(self.grid, other.grid):
+                row[:] = source
+        self.variant = other.variant
+        self.size = other.size
+        for col in (1, -1):
+            own = self.pieces[col]
+            own.clear()
+            own.update(other.pieces[col])
+            self.men[col] = other.men[col]
+            self.kings[col] = other.kings[col]
+        self.hash = other.hash
+        self.quiet_plies = other.quiet_plies
+        self.accumulator = None
+
+    def apply(self, move: "Move") -> None:
+        """Joue `move` sur la grille (sans vérifier sa légalité)."""
+        self.accumulator = None
+        grid = self.grid
+        piece = grid[move.r][move.c]
+        col = 1 if piece > 0 else -1
+        h = self.hash ^ ZOBRIST[piece][move.r][move.c]
+        for mr, mc in move.captures:
+            taken = grid[mr][mc]
+            grid[mr][mc] = 0
+            h ^= ZOBRIST[taken][mr][mc]
+            self.pieces[-col].discard((mr, mc))
+            if is_king(taken):
+                self.kings[-col] -= 1
+            else:
+                self.men[-col] -= 1
+        grid[move.r][move.c] = 0
+        own = self.pieces[col]
+        own.discard((move.r, move.c))
+        own.add((move.r2, move.c2))
+        landed = 2 * piece if move.promotion else piece
+        grid[move.r2][move.c2] = landed
+        self.hash = h ^ ZOBRIST[landed][move.r2][move.c2]
+        if move.promotion:
+            self.men[col] -= 1
+            self.kings[col] += 1
+        # seul un coup de dame sans prise est réversible
+        if move.captures or not is_king(piece):
+            self.quiet_plies = 0
+        else:
+            self.quiet_plies += 1
+
+
+class Move:
+    """
+    Coup compact : case de départ, case d'arrivée, pièces prises et promotion.
+    `__slots__` : pas de dict par instance, ce qui compte pour les millions de
+    coups générés pendant une recherche.
+    """
+
+    __slots__ = ("r", "c", "r2", "c2", "captures", "promotion")
+
+    def __init__(
+        self, r: int, c: int, r2: int, c2: int, captures: Tuple[Position, ...] = (), promotion: bool = False
+    ) -> None:
+        self.r = r
+        self.c = c
+        self.r2 = r2
+        self.c2 = c2
+        self.captures = captures
+        self.promotion = promotion
+
+    def as_tuple(self) -> MoveTuple:
+        """(r, c, r2, c2) : forme sérialisable (JSON, cache, réseau)."""
+        return (self.r, self.c, self.r2, self.c2)
+
+    def as_compact(self) -> Tuple[int, ...]:
+        """
+        (r, c, r2, c2, puis les cases prises à plat) : distingue deux rafles
+        de mêmes extrémités, que `as_tuple` confond.
+        """
+        return (self.r, self.c, self.r2, self.c2) + tuple(v for cell in self.captures for v in cell)
+
+    def matches(self, compact: Sequence[int]) -> bool:
+        """Vrai si `compact` désigne ce coup (extrémités seules, ou forme `as_compact`)."""
+        if len(compact) == 4:
+            return self.as_tuple() == tuple(compact)
+        return self.as_compact() == tuple(compact)
+
+    def sort_key(self) -> Tuple:
+        """Ordre canonique, indépendant de l'ordre de génération (historique du plateau)."""
+        return (self.r, self.c, self.r2, self.c2, self.captures)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Move):
+            return NotImplemented
+        return (
+            self.r == other.r
+            and self.c == other.c
+            and self.r2 == other.r2
+            and self.c2 == other.c2
+            and self.captures == other.captures
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.r, self.c, self.r2, self.c2, self.captures))
+
+    def __str__(self) -> str:
+        """Notation « rc-r2c2 » (« rcxr2c2 » pour une prise)."""
+        sep = "x" if self.captures else "-"
+        return f"{self.r}{self.c}{sep}{self.r2}{self.c2}"
+
+    def __repr__(self) -> str:
+        return f"Move({self})"
+
+
+# Clés de Zobrist : tirage à graine fixe pour que les hash soient stables
+# d'un lancement à l'autre. Dimensionnées pour le plus grand plateau.
+MAX_SIZE = 10
+_zobrist_rng = random.Random(0x44414D4553)
+ZOBRIST = {
+    piece: [[_zobrist_rng.getrandbits(64) for _ in range(MAX_SIZE)] for _ in range(MAX_SIZE)]
+    for piece in (1, 2, -1, -2)
+}
+ZOBRIST_BLACK_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+
+def position_key(board: Board, turn: int) -> int:
+    """Hash 64 bits de la position (pièces + camp au trait), tenu à jour par Board."""
+    return board.hash ^ ZOBRIST_BLACK_TO_MOVE if turn == -1 else board.hash
+
 
 # Directions pour les pions et les dames
 WHITE_DIRS = [(-1, -1), (-1, 1)]
@@ -53,133 +241,412 @@ BLACK_DIRS = [(1, -1), (1, 1)]
 KING_DIRS = WHITE_DIRS + BLACK_DIRS
 
 
-def inside(r: int, c: int) -> bool:
-    return 0 <= r < 8 and 0 <= c < 8
+def inside(r: int, c: int, size: int = 8) -> bool:
+    return 0 <= r < size and 0 <= c < size
 
 
-def get_captures(board: Board, r: int, c: int) -> List[CaptureMove]:
-    moves: List[CaptureMove] = []
-    piece = board.grid[r][c]
-    col = color(piece)
-    if col == 0:
-        return moves
+def _promotes(piece: int, r2: int, size: int = 8) -> bool:
+    return (piece == 1 and r2 == 0) or (piece == -1 and r2 == size - 1)
+
+
+def _piece_dirs(piece: int) -> List[Position]:
+    if is_king(piece):
+        return KING_DIRS
+    return WHITE_DIRS if color(piece) == 1 else BLACK_DIRS
 
-    directions = KING_DIRS if is_king(piece) else (WHITE_DIRS if col == 1 else BLACK_DIRS)
 
-    for dr, dc in directions:
-        mid_r, mid_c = r + dr, c + dc
-        end_r, end_c = r + 2 * dr, c + 2 * dc
-        if inside(end_r, end_c) and inside(mid_r, mid_c):
-            middle_piece = board.grid[mid_r][mid_c]
-            landing_piece = board.grid[end_r][end_c]
-            if color(middle_piece) == -col and landing_piece == 0:
-                moves.append((end_r, end_c, mid_r, mid_c))
+# Tables précalculées une fois par variante, par pièce et par case :
+#   steps[piece][r][c] : (r2, c2, coup) pour chaque pas possible ;
+#   jumps[piece][r][c] : (mr, mc, r2, c2, coup) pour chaque saut possible ;
+#   rays[r][c]         : pour chaque direction, les cases (r2, c2, coup) en
+#                        s'éloignant (dames volantes).
+# Seules les cibles dans le plateau y figurent : la génération de coups n'a
+# plus ni test de bornes ni calcul de direction, et son coût par case ne
+# dépend pas de la taille du plateau. Les coups sont partagés (jamais
+# modifiés), la génération n'alloue donc que la liste résultat.
+StepTable = Dict[int, List[List[Tuple[Tuple[int, int, Move], ...]]]]
+JumpTable = Dict[int, List[List[Tuple[Tuple[int, int, int, int, Move], ...]]]]
+RayTable = List[List[Tuple[Tuple[Tuple[int, int, Move], ...], ...]]]
+
+
+def _build_move_tables(size: int, men_capture_backward: bool) -> Tuple[StepTable, JumpTable]:
+    steps_table: StepTable = {}
+    jumps_table: JumpTable = {}
+    for piece in (1, 2, -1, -2):
+        steps_table[piece] = [[() for _ in range(size)] for _ in range(size)]
+        jumps_table[piece] = [[() for _ in range(size)] for _ in range(size)]
+        jump_dirs = KING_DIRS if men_capture_backward else _piece_dirs(piece)
+        for r in range(size):
+            for c in range(size):
+                if (r + c) % 2 == 0:
+                    continue  # cases claires : jamais occupées
+                steps = []
+                jumps = []
+                for dr, dc in _piece_dirs(piece):
+                    nr, nc = r + dr, c + dc
+                    if inside(nr, nc, size):
+                        steps.append((nr, nc, Move(r, c, nr, nc, (), _promotes(piece, nr, size))))
+                for dr, dc in jump_dirs:
+                    nr, nc = r + dr, c + dc
+                    er, ec = r + 2 * dr, c + 2 * dc
+                    if inside(er, ec, size):
+                        jumps.append((nr, nc, er, ec, Move(r, c, er, ec, ((nr, nc),), _promotes(piece, er, size))))
+                steps_table[piece][r][c] = tuple(steps)
+                jumps_table[piece][r][c] = tuple(jumps)
+    return steps_table, jumps_table
+
+
+def _build_rays(size: int) -> RayTable:
+    rays: RayTable = [[() for _ in range(size)] for _ in range(size)]
+    for r in range(size):
+        for c in range(size):
+            if (r + c) % 2 == 0:
+                continue
+            per_dir = []
+            for dr, dc in KING_DIRS:
+                ray = []
+                nr, nc = r + dr, c + dc
+                while inside(nr, nc, size):
+                    ray.append((nr, nc, Move(r, c, nr, nc)))
+                    nr, nc = nr + dr, nc + dc
+                if ray:
+                    per_dir.append(tuple(ray))
+            rays[r][c] = tuple(per_dir)
+    return rays
+
+
+class Variant:
+    """
+    Règles d'une variante : taille du plateau, rangées de pions au départ et
+    options de prise.
+    - `flying_kings` : la dame se déplace et prend à distance ;
+    - `men_capture_backward` : les pions prennent aussi en arrière ;
+    - `chain_captures` : la prise continue tant qu'elle est possible (rafle) ;
+    - `majority_capture` : il faut jouer la rafle qui prend le plus de pièces ;
+    - `crown_ends_capture` : un pion qui atteint la dernière rangée s'arrête ;
+    - `no_progress_plies` : partie nulle après ce nombre de demi-coups sans
+      prise ni mouvement de pion (seules les dames bougent).
+    Une position répétée trois fois est nulle dans toutes les variantes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        size: int = 8,
+        rows: int = 3,
+        flying_kings: bool = False,
+        men_capture_backward: bool = False,
+        chain_captures: bool = False,
+        majority_capture: bool = False,
+        crown_ends_capture: bool = False,
+        no_progress_plies: int = 50,
+    ) -> None:
+        self.name = name
+        self.label = label
+        self.size = size
+        self.rows = rows
+        self.flying_kings = flying_kings
+        self.men_capture_backward = men_capture_backward
+        self.chain_captures = chain_captures
+        self.majority_capture = majority_capture
+        self.crown_ends_capture = crown_ends_capture
+        self.no_progress_plies = no_progress_plies
+        # prise simple sans dame volante : les sauts précalculés suffisent
+        self.sequences = chain_captures or flying_kings
+        self.steps, self.jumps = _build_move_tables(size, men_capture_backward)
+        self.rays: Optional[RayTable] = _build_rays(size) if flying_kings else None
+
+    def __repr__(self) -> str:
+        return f"Variant({self.name}, {self.size}x{self.size})"
+
+
+# Règles historiques du jeu : 8x8, une seule prise par coup, dames à un pas.
+CLASSIC = Variant("classique", "Classique 8x8")
+VARIANTS: Dict[str, Variant] = {
+    variant.name: variant
+    for variant in (
+        CLASSIC,
+        Variant("anglaise", "Anglaise 8x8", chain_captures=True, crown_ends_capture=True, no_progress_plies=80),
+        Variant(
+            "bresilienne", "Brésilienne 8x8",
+            flying_kings=True, men_capture_backward=True, chain_captures=True, majority_capture=True,
+        ),
+        Variant(
+            "internationale", "Internationale 10x10", size=10, rows=4,
+            flying_kings=True, men_capture_backward=True, chain_captures=True, majority_capture=True,
+        ),
+    )
+}
+
+
+def get_variant(name: Optional[str]) -> Variant:
+    """Variante par nom ; la classique si `name` est vide."""
+    if not name:
+        return CLASSIC
+    try:
+        return VARIANTS[name.strip().lower()]
+    except KeyError:
+        raise ValueError(f"Variante inconnue : {name!r} (choix : {', '.join(VARIANTS)})") from None
+
+
+def get_captures(board: Board, r: int, c: int) -> List[Move]:
+    grid = board.grid
+    piece = grid[r][c]
+    if piece == 0:
+        return []
+    variant = board.variant
+    if variant.sequences:
+        # la plupart des pièces n'ont aucune prise : on le vérifie sans
+        # préparer le parcours des rafles
+        if variant.flying_kings and (piece == 2 or piece == -2):
+            for ray in variant.rays[r][c]:
+                for i, (mr, mc, _) in enumerate(ray):
+                    target = grid[mr][mc]
+                    if target:
+                        if target * piece < 0 and i + 1 < len(ray) and grid[ray[i + 1][0]][ray[i + 1][1]] == 0:
+                            return _capture_sequences(board, r, c, piece)
+                        break
+            return []
+        for mr, mc, er, ec, _ in variant.jumps[piece][r][c]:
+            if grid[mr][mc] * piece < 0 and grid[er][ec] == 0:
+                return _capture_sequences(board, r, c, piece)
+        return []
+    # pièce adverse au milieu : produit des valeurs négatif
+    return [
+        move for mr, mc, er, ec, move in variant.jumps[piece][r][c] if grid[mr][mc] * piece < 0 and grid[er][ec] == 0
+    ]
+
+
+def _capture_sequences(board: Board, r: int, c: int, piece: int) -> List[Move]:
+    """
+    Prises de la pièce en (r, c) avec rafles et/ou dames volantes : parcours
+    en profondeur des enchaînements. Pendant la rafle, les pièces prises
+    restent sur le plateau (ni sautées deux fois, ni traversées) et la case
+    de départ compte comme vide. Un pion n'est promu que s'il termine sur la
+    dernière rangée.
+    """
+    variant = board.variant
+    grid = board.grid
+    king = is_king(piece)
+    rays = variant.rays if king and variant.flying_kings else None
+    jumps = variant.jumps[piece]
+    chain = variant.chain_captures
+    crown_row = 0 if piece > 0 else board.size - 1
+    stop_on_crown = variant.crown_ends_capture and not king
+    moves: List[Move] = []
+    seen: Set[Tuple[int, int, frozenset]] = set()
+
+    def empty(er: int, ec: int) -> bool:
+        return grid[er][ec] == 0 or (er == r and ec == c)
+
+    def emit(er: int, ec: int, taken: Tuple[Position, ...]) -> None:
+        # une dame peut atteindre la même case par deux chemins : un seul coup
+        key = (er, ec, frozenset(taken))
+        if key not in seen:
+            seen.add(key)
+            moves.append(Move(r, c, er, ec, taken, not king and er == crown_row))
+
+    def land(er: int, ec: int, taken: Tuple[Position, ...]) -> None:
+        if not chain or (stop_on_crown and er == crown_row):
+            emit(er, ec, taken)
+        else:
+            extend(er, ec, taken)
+
+    def extend(sr: int, sc: int, taken: Tuple[Position, ...]) -> None:
+        found = False
+        if rays is not None:
+            for ray in rays[sr][sc]:
+                n = len(ray)
+                i = 0
+                while i < n and empty(ray[i][0], ray[i][1]):
+                    i += 1
+                if i >= n - 1:
+                    continue
+                mr, mc, _ = ray[i]
+                if grid[mr][mc] * piece >= 0 or (mr, mc) in taken:
+                    continue
+                after = taken + ((mr, mc),)
+                i += 1
+                while i < n and empty(ray[i][0], ray[i][1]):
+                    found = True
+                    land(ray[i][0], ray[i][1], after)
+                    i += 1
+        else:
+            for mr, mc, er, ec, _ in jumps[sr][sc]:
+                if grid[mr][mc] * piece < 0 and (mr, mc) not in taken and empty(er, ec):
+                    found = True
+                    land(er, ec, taken + ((mr, mc),))
+        if not found and taken:
+            emit(sr, sc, taken)
+
+    extend(r, c, ())
+    # `land` et `extend` se référencent : sans ce `del`, chaque appel
+    # laisserait un cycle que seul le GC cyclique libérerait
+    del land, extend
     return moves
 
 
-def get_simple_moves(board: Board, r: int, c: int) -> List[Position]:
-    moves: List[Position] = []
-    piece = board.grid[r][c]
-    col = color(piece)
-    if col == 0:
+def get_simple_moves(board: Board, r: int, c: int) -> List[Move]:
+    grid = board.grid
+    piece = grid[r][c]
+    if piece == 0:
+        return []
+    variant = board.variant
+    if variant.flying_kings and (piece == 2 or piece == -2):
+        moves: List[Move] = []
+        for ray in variant.rays[r][c]:
+            for nr, nc, move in ray:
+                if grid[nr][nc]:
+                    break
+                moves.append(move)
         return moves
+    return [move for nr, nc, move in variant.steps[piece][r][c] if grid[nr][nc] == 0]
+
+
+def all_captures(board: Board, player: int, out: Optional[List[Move]] = None) -> List[Move]:
+    """
+    Prises jouables par `player` (les plus longues si prise majoritaire).
+    `out` : liste réutilisée (vidée puis remplie) au lieu d'une nouvelle.
+    """
+    if out is None:
+        captures: List[Move] = []
+    else:
+        captures = out
+        captures.clear()
+    for r, c in board.pieces[player]:
+        captures.extend(get_captures(board, r, c))
+    if captures and board.variant.majority_capture:
+        most = max(len(move.captures) for move in captures)
+        captures[:] = [move for move in captures if len(move.captures) == most]
+    return captures
+
+
+def all_simple_moves(board: Board, player: int, out: Optional[List[Move]] = None) -> List[Move]:
+    if out is None:
+        moves: List[Move] = []
+    else:
+        moves = out
+        moves.clear()
+    for r, c in board.pieces[player]:
+        moves.extend(get_simple_moves(board, r, c))
+    return moves
 
-    directions = KING_DIRS if is_king(piece) else (WHITE_DIRS if col == 1 else BLACK_DIRS)
 
-    for dr, dc in directions:
-        nr, nc = r + dr, c + dc
-        if inside(nr, nc) and board.grid[nr][nc] == 0:
-            moves.append((nr, nc))
-    return moves
+def legal_moves(board: Board, player: int, out: Optional[List[Move]] = None) -> List[Move]:
+    """Coups légaux de `player` : la prise est obligatoire."""
+    captures = all_captures(board, player, out)
+    if captures:
+        return captures
+    return all_simple_moves(board, player, out)
+
+
+# Nombre d'occurrences d'une même position qui rend la partie nulle
+REPETITION_LIMIT = 3
 
 
 class Engine:
-    def __init__(self) -> None:
-        self.board = Board()
+    def __init__(self, variant: Optional[Variant] = None) -> None:
+        self.board = Board(variant)
+        self.variant = self.board.variant
         self.turn: int = 1  # 1 = blanc, -1 = noir
+        # incrémentée à chaque changement de position (caches côté interface)
+        self.version = 0
+        # occurrences des positions depuis le dernier coup irréversible (prise
+        # ou pion) : aucune position antérieure ne peut plus revenir
+        self.repetitions: Dict[int, int] = {}
+        self._reset_history()
+
+    def _reset_history(self) -> None:
+        self.repetitions = {position_key(self.board, self.turn): 1}
 
     def reset(self) -> None:
         self.board.reset()
         self.turn = 1
+        self.version += 1
+        self._reset_history()
+
+    def set_position(
+        self, grid: List[List[int]], turn: int, quiet_plies: int = 0, repetitions: Optional[Dict[int, int]] = None
+    ) -> None:
+        """
+        Position reçue d'ailleurs (autre processus, fichier), avec
+        l'historique utile aux nulles s'il est connu (voir `history`).
+        """
+        self.board.set_grid(grid)
+        self.board.quiet_plies = quiet_plies
+        self.turn = turn
+        self.version += 1
+        if repetitions:
+            self.repetitions = dict(repetitions)
+        else:
+            self._reset_history()
+
+    def history(self) -> Tuple[int, Dict[int, int]]:
+        """(demi-coups sans progrès, occurrences des positions) : pour `set_position`."""
+        return self.board.quiet_plies, dict(self.repetitions)
+
+    def draw_reason(self) -> Optional[str]:
+        """Motif de nulle de la position courante, None si la partie continue."""
+        if self.repetitions.get(position_key(self.board, self.turn), 0) >= REPETITION_LIMIT:
+            return "répétition"
+        if self.board.quiet_plies >= self.variant.no_progress_plies:
+            return f"{self.variant.no_progress_plies} demi-coups sans prise ni pion joué"
+        return None
 
     def _any_capture_available(self) -> bool:
-        for r in range(8):
-            for c in range(8):
-                if color(self.board.grid[r][c]) == self.turn:
-                    if get_captures(self.board, r, c):
-                        return True
+        for r, c in self.board.pieces[self.turn]:
+            if get_captures(self.board, r, c):
+                return True
         return False
 
     def get_legal_moves(self, r: int, c: int) -> List[Tuple[int, int]]:
+        """Cases d'arrivée possibles pour la pièce en (r, c)."""
+        return [(m.r2, m.c2) for m in self.legal_moves_from(r, c)]
+
+    def legal_moves_from(self, r: int, c: int) -> List[Move]:
         piece = self.board.grid[r][c]
         if color(piece) != self.turn:
             return []
-        captures = get_captures(self.board, r, c)
         if self._any_capture_available():
-            return [(r2, c2) for r2, c2, _, _ in captures]
+            if self.variant.majority_capture:
+                # seules les rafles les plus longues du camp sont jouables
+                return [m for m in all_captures(self.board, self.turn) if m.r == r and m.c == c]
+            return get_captures(self.board, r, c)
         return get_simple_moves(self.board, r, c)
 
     def move_piece(self, r: int, c: int, r2: int, c2: int) -> bool:
-        piece = self.board.grid[r][c]
-        if color(piece) != self.turn:
-            return False
-
-        captures = get_captures(self.board, r, c)
-        must_capture = self._any_capture_available()
-        target_capture = None
-        if captures:
-            for move in captures:
-                if (move[0], move[1]) == (r2, c2):
-                    target_capture = move
-                    break
-
-        if must_capture and target_capture is None:
-            return False
-
-        if target_capture:
-            r_cap, c_cap = target_capture[2], target_capture[3]
-            self.board.grid[r_cap][c_cap] = 0
-        elif must_capture:
-            return False
-        elif (r2, c2) not in get_simple_moves(self.board, r, c):
-            return False
-
-        self.board.grid[r][c] = 0
-        self.board.grid[r2][c2] = piece
-
-        if r2 == 0 and piece == 1:
-            self.board.grid[r2][c2] = 2
-        elif r2 == 7 and piece == -1:
-            self.board.grid[r2][c2] = -2
+        # plusieurs rafles peuvent mener à la même case : la première est jouée
+        for move in self.legal_moves_from(r, c):
+            if move.r2 == r2 and move.c2 == c2:
+                self.play(move)
+                return True
+        return False
 
+    def play(self, move: Move) -> None:
+        """Joue un coup déjà validé (issu de la génération de coups)."""
+        self.board.apply(move)
         self.turn *= -1
-        return True
+        self.version += 1
+        if not self.board.quiet_plies:
+            self.repetitions.clear()
+        key = position_key(self.board, self.turn)
+        self.repetitions[key] = self.repetitions.get(key, 0) + 1
 
-    def get_hint(self) -> Optional[Tuple[int, int, int, int]]:
+    def get_hint(self) -> Optional[Move]:
         """
-        Retourne un hint sous la forme (r, c, r2, c2)
+        Retourne un hint (premier coup légal trouvé, prise en priorité)
         ou None si aucun coup.
         """
         b = self.board
+        # ordre de lecture du plateau : hint stable quel que soit l'historique
+        captures = all_captures(b, self.turn)
+        if captures:
+            return min(captures, key=lambda m: (m.r, m.c))
 
-        # 1. rechercher captures
-        for r in range(8):
-            for c in range(8):
-                p = b.grid[r][c]
-                if color(p) == self.turn:
-                    caps = get_captures(b, r, c)
-                    if caps:
-                        r2, c2, _, _ = caps[0]
-                        return (r, c, r2, c2)
-
-        # 2. rechercher mouvements simples
-        for r in range(8):
-            for c in range(8):
-                p = b.grid[r][c]
-                if color(p) == self.turn:
-                    moves = get_simple_moves(b, r, c)
-                    if moves:
-                        r2, c2 = moves[0]
-                        return (r, c, r2, c2)
+        for r, c in sorted(b.pieces[self.turn]):
+            moves = get_simple_moves(b, r, c)
+            if moves:
+                return moves[0]
 
         return None
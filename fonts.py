@@ -0,0 +1,77 @@
+# fonts.py : polices résolues une seule fois, sans bloquer le premier frame
+"""
+`pygame.font.SysFont` parcourt toutes les polices du système à son premier
+appel (fc-list sous Linux), ce qui retarde l'ouverture de la fenêtre.
+
+Ici, le chemin de la police est mis en cache sur disque. Au premier
+lancement, il est résolu dans un thread d'arrière-plan ; en attendant,
+`get_font` rend la police par défaut de pygame, puis bascule sur la bonne
+police dès qu'elle est connue.
+"""
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+FONT_NAME = "segoe ui"
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "jeudedames", "fonts.json")
+
+_UNKNOWN = object()
+
+_paths: Dict[str, Optional[str]] = {}
+_fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+_resolving: Dict[str, threading.Thread] = {}
+_disk_loaded = False
+
+
+def _load_disk_cache() -> None:
+    global _disk_loaded
+    _disk_loaded = True
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return
+    for name, path in data.items():
+        # police désinstallée depuis : on la résoudra de nouveau
+        if path is None or os.path.exists(path):
+            _paths[name] = path
+
+
+def _save_disk_cache() -> None:
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(_paths, f)
+    except OSError:
+        pass
+
+
+def _resolve(name: str) -> None:
+    _paths[name] = pygame.font.match_font(name)
+    _save_disk_cache()
+
+
+def resolve_in_background(name: str = FONT_NAME) -> None:
+    if not _disk_loaded:
+        _load_disk_cache()
+    if name in _paths or name in _resolving:
+        return
+    thread = threading.Thread(target=_resolve, args=(name,), name=f"font-{name}", daemon=True)
+    _resolving[name] = thread
+    thread.start()
+
+
+def get_font(size: int, name: str = FONT_NAME) -> pygame.font.Font:
+    """Police `name` en taille `size` ; police par défaut tant qu'elle n'est pas résolue."""
+    path = _paths.get(name, _UNKNOWN)
+    if path is _UNKNOWN:
+        resolve_in_background(name)
+        path = _paths.get(name)
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(path, size)
+    return font
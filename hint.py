@@ -0,0 +1,204 @@
+# hint.py : conseil de coup (touche H) calculé par la recherche de l'IA
+"""
+Pendant que le joueur réfléchit, un processus d'arrière-plan lance
+l'approfondissement itératif de l'IA sur la position courante. Chaque
+profondeur terminée remplace le conseil : plus le joueur attend, meilleur
+il est. Les coups suivants du classement (analyse multi-PV) sont aussi
+proposés. Le conseil est rattaché à la version de la position
+(`Engine.version`), appuyer plusieurs fois sur H ne coûte donc rien.
+
+Un processus plutôt qu'un thread : une recherche en Python pur dans le
+processus du jeu lui disputerait le GIL et ferait sauter des frames. Il est
+lancé en mode « spawn » sur toutes les plateformes : un fork du jeu
+hériterait de l'état de Pygame (fenêtre, threads, verrous). `multiprocessing`
+n'est importé qu'au lancement du worker, hors du chemin du premier frame.
+"""
+import os
+import threading
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from ai import AI, SearchPool
+from engine import Engine, Move, get_variant
+
+HINT_MAX_DEPTH = 12
+HINT_MAX_SECONDS = 15.0
+HINT_CANDIDATES = 3
+
+# (variante, grille, trait, historique `Engine.history`, numéro de recherche)
+# ou None pour mettre le worker en pause
+Job = Optional[Tuple[str, List[List[int]], int, Tuple[int, Dict[int, int]], int]]
+
+
+def _hint_process(conn, max_depth: int, max_seconds: float, k: int) -> None:
+    """Boucle du processus worker : une recherche à la fois, la plus récente."""
+    if hasattr(os, "nice"):
+        # priorité basse : sur une machine chargée, le rendu passe d'abord
+        os.nice(10)
+    pending: List[Job] = []
+    ready = threading.Condition()
+    current: List[Optional[AI]] = [None]
+    closed = [False]
+    # plateaux de recherche partagés par les analyses successives
+    pool = SearchPool()
+
+    def listen() -> None:
+        # un nouveau travail interrompt immédiatement la recherche en cours
+        while True:
+            try:
+                job = conn.recv()
+            except (EOFError, OSError):
+                job = "close"
+            with ready:
+                if job == "close":
+                    closed[0] = True
+                else:
+                    pending[:] = [job]
+                if current[0] is not None:
+                    current[0].stop()
+                ready.notify()
+            if job == "close":
+                return
+
+    threading.Thread(target=listen, name="hint-listen", daemon=True).start()
+    while True:
+        with ready:
+            while not pending and not closed[0]:
+                ready.wait()
+            if closed[0]:
+                return
+            job = pending.pop()
+            if job is None:
+                continue
+            variant, grid, turn, history, token = job
+            engine = Engine(get_variant(variant))
+            # historique des positions : les répétitions sont nulles pour la recherche
+            engine.set_position(grid, turn, *history)
+            ai = AI(engine, level=3, pool=pool)
+            ai.on_iteration = lambda depth, move, score: conn.send(
+                (token, depth, [(cand.move.as_compact(), cand.score) for cand in ai.candidates])
+            )
+            current[0] = ai
+        try:
+            ai.analyse(max_depth, k, perf_counter() + max_seconds)
+        except (BrokenPipeError, OSError):
+            return
+        with ready:
+            current[0] = None
+
+
+class HintWorker:
+    def __init__(
+        self, max_depth: int = HINT_MAX_DEPTH, max_seconds: float = HINT_MAX_SECONDS, k: int = HINT_CANDIDATES
+    ) -> None:
+        self.max_depth = max_depth
+        self.max_seconds = max_seconds
+        self.k = k
+        self._conn = None
+        self._process = None
+        self._token = 0
+        self._running = False
+        self._source: Optional[Engine] = None
+        self._version = -1
+        # classement (coup `Move.as_compact`, score) de la profondeur la plus grande reçue
+        self._candidates: List[Tuple[Tuple[int, ...], float]] = []
+        self.depth = 0
+
+    def _start_process(self) -> None:
+        import multiprocessing
+
+        context = multiprocessing.get_context("spawn")
+        # le processus réimporte le module principal (main.py) : sans la
+        # bannière de Pygame, qui s'afficherait une seconde fois
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        parent, child = context.Pipe()
+        self._process = context.Process(
+            target=_hint_process, args=(child, self.max_depth, self.max_seconds, self.k), name="hint", daemon=True
+        )
+        self._process.start()
+        child.close()
+        self._conn = parent
+
+    def follow(self, engine: Engine, active: bool) -> None:
+        """
+        À appeler à chaque frame. `active` : le joueur humain a la main.
+        Relance la recherche quand la position change, la met en pause sinon.
+        """
+        self._drain()
+        if not active:
+            self.stop()
+            return
+        same = engine is self._source and engine.version == self._version
+        if same and self._running:
+            return
+        if not same:
+            self._source = engine
+            self._version = engine.version
+            self._candidates = []
+            self.depth = 0
+        if self._process is None:
+            self._start_process()
+        self._token += 1
+        # relance sur la même position : seuls les résultats plus profonds comptent
+        grid = [row[:] for row in engine.board.grid]
+        self._running = self._send((engine.variant.name, grid, engine.turn, engine.history(), self._token))
+
+    def _send(self, message) -> bool:
+        try:
+            self._conn.send(message)
+            return True
+        except OSError:
+            # worker disparu : plus de conseil calculé, main.py retombe sur get_hint
+            self._conn = None
+            self._process = None
+            return False
+
+    def _drain(self) -> None:
+        conn = self._conn
+        if conn is None:
+            return
+        try:
+            while conn.poll():
+                token, depth, candidates = conn.recv()
+                if token == self._token and depth > self.depth:
+                    self._candidates = candidates
+                    self.depth = depth
+        except (EOFError, OSError):
+            self._conn = None
+            self._process = None
+            self._running = False
+
+    def candidates_for(self, engine: Engine) -> List[Tuple[Move, float]]:
+        """Coups classés (coup, score) déjà calculés pour la position courante."""
+        self._drain()
+        if engine is not self._source or engine.version != self._version:
+            return []
+        ranked = []
+        for compact, score in self._candidates:
+            # prises comprises : deux rafles de mêmes extrémités restent distinctes
+            for move in engine.legal_moves_from(compact[0], compact[1]):
+                if move.matches(compact):
+                    ranked.append((move, score))
+                    break
+        return ranked
+
+    def stop(self) -> None:
+        """Met la recherche en pause (le conseil déjà calculé est conservé)."""
+        if self._running and self._conn is not None:
+            self._send(None)
+        self._running = False
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.send("close")
+            except OSError:
+                pass
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        self._running = False
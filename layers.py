@@ -0,0 +1,93 @@
+# layers.py : calques pré-composés du plateau (rendu sans allocation par frame)
+"""
+Tout ce qui ne change pas d'une frame à l'autre est dessiné une fois puis
+seulement blitté :
+
+- fond : couleur de fond, barre supérieure et cases du plateau, un calque
+  par thème ;
+- surbrillance de sélection : une surface (pulses et halos sont dans
+  effects.py) ;
+- voile du mode nuit : une surface plein écran remplie sur place ;
+- textes : rendus mis en cache par (police, texte, couleur).
+
+Une frame du plateau se réduit ainsi à quelques blits. Les calques sont
+propres à une taille de fenêtre : un redimensionnement crée un nouveau
+`BoardLayers` (main.apply_layout), qui rend chaque calque une fois.
+"""
+from typing import Dict, Hashable, Optional, Tuple
+
+import pygame
+
+Color = Tuple[int, ...]
+
+# Textes gardés en cache au plus (les minuteurs changent chaque seconde)
+MAX_TEXTS = 64
+
+
+class BoardLayers:
+    def __init__(
+        self, width: int, height: int, cell: int, board_size: int, offset_y: int, scale: float = 1.0
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.board_size = board_size
+        self.offset_y = offset_y
+        self.scale = scale
+        self._backgrounds: Dict[Hashable, pygame.Surface] = {}
+        self._texts: Dict[Tuple[pygame.font.Font, str, Color], pygame.Surface] = {}
+        self._selection: Optional[pygame.Surface] = None
+        self._veil: Optional[pygame.Surface] = None
+
+    def _px(self, value: float) -> int:
+        return max(1, round(value * self.scale))
+
+    def background(self, theme: Dict[str, Color]) -> pygame.Surface:
+        """Fond, barre supérieure et cases du plateau pour `theme`."""
+        key = tuple(theme.items())
+        layer = self._backgrounds.get(key)
+        if layer is None:
+            layer = self._backgrounds[key] = self._draw_background(theme)
+        return layer
+
+    def _draw_background(self, theme: Dict[str, Color]) -> pygame.Surface:
+        cell = self.cell
+        layer = pygame.Surface((self.width, self.height))
+        layer.fill(theme["bg"])
+        pygame.draw.rect(layer, theme["overlay"], pygame.Rect(0, 0, self.width, self.offset_y))
+        for r in range(self.board_size):
+            for c in range(self.board_size):
+                x = c * cell
+                y = self.offset_y + r * cell
+                is_dark = (r + c) % 2 == 1
+                pygame.draw.rect(layer, theme["dark"] if is_dark else theme["light"], (x, y, cell, cell))
+                # léger shading sur cases foncées
+                if is_dark:
+                    pygame.draw.rect(layer, (0, 0, 0, 40), (x + 2, y + 2, cell - 4, cell - 4), 1)
+        return layer
+
+    def selection(self) -> pygame.Surface:
+        if self._selection is None:
+            cell = self.cell
+            surf = pygame.Surface((cell, cell), pygame.SRCALPHA)
+            outer, inner, radius = self._px(3), self._px(8), self._px(10)
+            pygame.draw.rect(surf, (0, 200, 255, 90), (outer, outer, cell - 2 * outer, cell - 2 * outer), border_radius=radius)
+            pygame.draw.rect(surf, (255, 255, 255, 50), (inner, inner, cell - 2 * inner, cell - 2 * inner), border_radius=radius)
+            self._selection = surf
+        return self._selection
+
+    def veil(self, color: Color) -> pygame.Surface:
+        """Voile plein écran de couleur RGBA `color`, rempli sur place."""
+        if self._veil is None:
+            self._veil = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self._veil.fill(color)
+        return self._veil
+
+    def text(self, font: pygame.font.Font, text: str, color: Color) -> pygame.Surface:
+        key = (font, text, color)
+        surf = self._texts.get(key)
+        if surf is None:
+            if len(self._texts) >= MAX_TEXTS:
+                self._texts.clear()
+            surf = self._texts[key] = font.render(text, True, color)
+        return surf
@@ -1,38 +1,120 @@
 import math
+import os
+import threading
 import pygame
 from typing import List, Optional, Tuple
 
-from engine import Engine, color, get_captures, get_simple_moves
-from ai import AI
+from engine import Engine, Move, all_captures, color, get_captures, get_simple_moves, get_variant
+from ai import AI, LEVELS, Evaluator, SearchStats
+from analysis_cache import AnalysisCache
+from effects import (
+    CAPTURE_PULSE,
+    HINT_HALO,
+    HINT_TARGET_RING,
+    LAST_MOVE,
+    PROMOTION_GLOW,
+    SELECT_PULSE,
+    SHAKE,
+    EffectLayer,
+)
+from fonts import get_font
+from hint import HintWorker
+from layers import BoardLayers
+from profiler import FrameProfiler
+from timeman import parse_time_control
 from theme import DAY, NIGHT
 from tutorial import Tutorial
 from animation import (
     Animation,
-    CapturePulseAnimation,
     EndGameAnimation,
-    LastMoveFadeAnimation,
     MoveAnimation,
-    PromotionGlowAnimation,
-    SelectPulseAnimation,
-    ShakeAnimation,
     StartupFadeAnimation,
-    draw_piece_shape,
+    piece_sprite,
 )
 
 current_theme = DAY
 
 
+# Variante de règles : DAMES_VARIANTE=classique (défaut), anglaise, bresilienne ou internationale
+VARIANT = get_variant(os.environ.get("DAMES_VARIANTE"))
+BOARD_SIZE = VARIANT.size
+
 # CONSTANTES UI
-CELL = 80
-WIDTH = CELL * 8
-HEIGHT = CELL * 8 + 60  # espace pour overlay
+# Fenêtre de départ : même largeur quelle que soit la variante. Les cotes
+# ci-dessous sont celles de ce gabarit et suivent la taille de la fenêtre.
+BASE_WIDTH = 640
+BASE_BAR = 50  # barre supérieure
+BASE_MARGIN = 10  # sous le plateau (texte du conseil)
+BASE_FONT = 20
+MIN_CELL = 24
 FPS = 60
 
+# Redimensionnement : mise en page refaite une fois le glissé terminé
+RESIZE_DEBOUNCE_MS = 150
+
 HINT_SOURCE = (0, 130, 255)
 HINT_TARGET = (0, 200, 255)
 CAPTURE_PULSE_COLOR = (0, 170, 150)
-SHAKE_AMPLITUDE = 4
-OFFSET_Y = 50
+LAST_MOVE_COLOR = (0, 150, 255)
+
+profiler = FrameProfiler.from_env(FPS)
+
+
+def apply_layout(
+    window_width: int = BASE_WIDTH, window_height: int = BASE_WIDTH + BASE_BAR + BASE_MARGIN
+) -> None:
+    """
+    Plus grand plateau qui tient dans la fenêtre. Les calques et les pièces
+    sont rendus une fois à la nouvelle taille (caches par taille), jamais
+    mis à l'échelle frame par frame. Sans argument : fenêtre au gabarit 640.
+    """
+    global CELL, WIDTH, HEIGHT, OFFSET_Y, UI_SCALE, FONT_SIZE, layers
+    chrome = (BASE_BAR + BASE_MARGIN) / BASE_WIDTH
+    board_px = min(window_width, window_height / (1 + chrome))
+    CELL = max(MIN_CELL, int(board_px) // BOARD_SIZE)
+    WIDTH = CELL * BOARD_SIZE
+    UI_SCALE = WIDTH / BASE_WIDTH
+    OFFSET_Y = round(BASE_BAR * UI_SCALE)
+    HEIGHT = WIDTH + OFFSET_Y + round(BASE_MARGIN * UI_SCALE)
+    FONT_SIZE = max(10, round(BASE_FONT * UI_SCALE))
+    # calques du plateau, rendus une fois par thème
+    layers = BoardLayers(WIDTH, HEIGHT, CELL, BOARD_SIZE, OFFSET_Y, UI_SCALE)
+
+
+def px(value: float) -> int:
+    """Cote de l'interface (en pixels du gabarit 640) à l'échelle courante."""
+    return max(1, round(value * UI_SCALE))
+
+
+# Résultats de recherche partagés entre les parties de la session
+analysis_cache = AnalysisCache(max_entries=50_000)
+
+# Cadence optionnelle : DAMES_CADENCE=blitz, rapide ou "base+incrément" (secondes)
+TIME_CONTROL = parse_time_control(os.environ.get("DAMES_CADENCE"))
+
+
+def load_network(path: Optional[str]) -> Optional[Evaluator]:
+    """Réseau d'évaluation (nnue.py) ; None (évaluation matérielle) si indisponible."""
+    if not path:
+        return None
+    try:
+        # NumPy n'est importé que si un réseau est demandé
+        from nnue import NetworkEvaluator
+
+        network = NetworkEvaluator.load(path)
+    except (ImportError, OSError, KeyError, ValueError) as exc:
+        print(f"Réseau d'évaluation désactivé : {exc}")
+        return None
+    if network.size != BOARD_SIZE:
+        print(f"Réseau d'évaluation désactivé : entraîné pour {network.size}x{network.size}")
+        return None
+    print(f"Évaluation par réseau : {path} ({network.name})")
+    return network
+
+
+# Graine de l'IA (bruit d'évaluation) : DAMES_GRAINE=1234 rejoue les mêmes choix,
+# sinon une graine par partie, affichée dans la console
+FIXED_SEED = int(os.environ["DAMES_GRAINE"]) if os.environ.get("DAMES_GRAINE") else None
 
 
 def format_time(t: float) -> str:
@@ -42,33 +124,17 @@ def format_time(t: float) -> str:
 
 
 def has_legal_moves(engine: Engine) -> bool:
-    capture_available = engine._any_capture_available()
-    for r in range(8):
-        for c in range(8):
-            p = engine.board.grid[r][c]
-            if color(p) != engine.turn:
-                continue
-            if capture_available:
-                if get_captures(engine.board, r, c):
-                    return True
-            else:
-                if get_simple_moves(engine.board, r, c):
-                    return True
+    # une prise ou un pas quelconque suffit : un coup légal existe alors
+    board = engine.board
+    for r, c in board.pieces[engine.turn]:
+        if get_simple_moves(board, r, c) or get_captures(board, r, c):
+            return True
     return False
 
 
 def capture_cells(engine: Engine) -> List[Tuple[int, int]]:
-    cells = []
-    if not engine._any_capture_available():
-        return cells
-    for r in range(8):
-        for c in range(8):
-            p = engine.board.grid[r][c]
-            if color(p) != engine.turn:
-                continue
-            if get_captures(engine.board, r, c):
-                cells.append((r, c))
-    return cells
+    # prise majoritaire : seules les pièces qui jouent une rafle maximale
+    return sorted({(m.r, m.c) for m in all_captures(engine.board, engine.turn)})
 
 
 def draw_board(
@@ -77,149 +143,149 @@ def draw_board(
     selected: Optional[Tuple[int, int]],
     moves: List[Tuple[int, int]],
     hint,
-    hint_alpha,
     font,
     timer_white,
     timer_black,
     animations: List[Animation],
     moving_targets: set,
-    shake_offsets,
+    effects: EffectLayer,
+    hint_candidates=(),
 ):
-    BG_COLOR = current_theme["bg"]
-    OVERLAY_COLOR = current_theme["overlay"]
-    BOARD_LIGHT = current_theme["light"]
-    BOARD_DARK = current_theme["dark"]
     TEXT_COLOR = current_theme["text"]
-    WHITE_PIECE = current_theme["piece_white"]
-    BLACK_PIECE = current_theme["piece_black"]
-    CROWN_COLOR = current_theme["crown"]
     is_night = current_theme == NIGHT
+    colors = {
+        "piece_white": current_theme["piece_white"],
+        "piece_black": current_theme["piece_black"],
+        "crown": current_theme["crown"],
+    }
 
-    # fond général
-    screen.fill(BG_COLOR)
-
-    # OVERLAY TOP BAR
-    pygame.draw.rect(screen, OVERLAY_COLOR, pygame.Rect(0, 0, WIDTH, 50))
+    # fond, barre supérieure et cases : calque pré-composé du thème
+    screen.blit(layers.background(current_theme), (0, 0))
 
     # Tour du joueur
     turn_text = "Tour des Blancs" if engine.turn == 1 else "Tour des Noirs"
-    tr = font.render(turn_text, True, TEXT_COLOR)
-    screen.blit(tr, (10, 12))
+    screen.blit(layers.text(font, turn_text, TEXT_COLOR), (px(10), px(12)))
 
     # Timers
-    txt_w = font.render(f"Blancs : {format_time(timer_white)}", True, TEXT_COLOR)
-    txt_b = font.render(f"Noirs   : {format_time(timer_black)}", True, TEXT_COLOR)
-    screen.blit(txt_w, (WIDTH - 230, 10))
-    screen.blit(txt_b, (WIDTH - 230, 28))
+    screen.blit(layers.text(font, f"Blancs : {format_time(timer_white)}", TEXT_COLOR), (WIDTH - px(230), px(10)))
+    screen.blit(layers.text(font, f"Noirs   : {format_time(timer_black)}", TEXT_COLOR), (WIDTH - px(230), px(28)))
 
     # ZONE DU PLATEAU
     offset_y = OFFSET_Y
 
-    for r in range(8):
-        for c in range(8):
-            x = c * CELL
-            y = offset_y + r * CELL
-            is_dark = (r + c) % 2 == 1
-            base = BOARD_DARK if is_dark else BOARD_LIGHT
-            pygame.draw.rect(screen, base, (x, y, CELL, CELL))
-
-            # léger shading sur cases foncées
-            if is_dark:
-                pygame.draw.rect(screen, (0, 0, 0, 40), (x + 2, y + 2, CELL - 4, CELL - 4), 1)
-
-            # highlight sélection
-            if selected == (r, c):
-                surf = pygame.Surface((CELL, CELL), pygame.SRCALPHA)
-                pygame.draw.rect(surf, (0, 200, 255, 90), (3, 3, CELL - 6, CELL - 6), border_radius=10)
-                pygame.draw.rect(surf, (255, 255, 255, 50), (8, 8, CELL - 16, CELL - 16), border_radius=10)
-                screen.blit(surf, (x, y))
+    # highlight sélection
+    if selected is not None:
+        screen.blit(layers.selection(), (selected[1] * CELL, offset_y + selected[0] * CELL))
 
     # possible moves
     for (mr, mc) in moves:
         cx = mc * CELL + CELL // 2
         cy = offset_y + mr * CELL + CELL // 2
-        pygame.draw.circle(screen, (40, 200, 120), (cx, cy), 9)
-        pygame.draw.circle(screen, (160, 255, 200), (cx, cy), 4)
+        pygame.draw.circle(screen, (40, 200, 120), (cx, cy), px(9))
+        pygame.draw.circle(screen, (160, 255, 200), (cx, cy), px(4))
 
     # pions avec ombres
-    for r in range(8):
-        for c in range(8):
-            piece = engine.board.grid[r][c]
-            if piece == 0:
-                continue
-
-            if (r, c) in moving_targets:
-                continue
-
-            dx, dy = shake_offsets.get((r, c), (0, 0))
-            cx = c * CELL + CELL // 2 + dx
-            cy = offset_y + r * CELL + CELL // 2 + dy
-
-            draw_piece_shape(
-                screen,
-                (cx, cy),
-                piece,
-                CELL,
-                {
-                    "piece_white": WHITE_PIECE,
-                    "piece_black": BLACK_PIECE,
-                    "crown": CROWN_COLOR,
-                },
-                is_night,
-                font,
-            )
+    shake_offsets = effects.offsets(CELL)
+    with profiler.stage("draw_piece_shape"):
+        grid = engine.board.grid
+        for col in (1, -1):
+            for r, c in engine.board.pieces[col]:
+                if (r, c) in moving_targets:
+                    continue
+                dx, dy = shake_offsets.get((r, c), (0, 0))
+                x = c * CELL + dx
+                y = offset_y + r * CELL + dy
+                for layer, (lx, ly) in piece_sprite(grid[r][c], CELL, colors, is_night, font):
+                    screen.blit(layer, (x + lx, y + ly))
+
+    # pulses, fondus et halos du conseil : une passe sur la couche d'effets
+    with profiler.stage("effects"):
+        effects.draw(screen, CELL, offset_y, UI_SCALE)
+
+    if hint and effects.active(HINT_HALO):
+        # texte indicatif, avec les coups suivants du classement de l'analyse
+        text = "Suggestion de coup (H)"
+        others = [f"{move} ({score:+g})" for move, score in hint_candidates if move != hint]
+        if others:
+            text += " · autres : " + ", ".join(others)
+        screen.blit(layers.text(font, text, (0, 190, 255)), (px(10), HEIGHT - px(24)))
+
+    if is_night:
+        t = pygame.time.get_ticks() / 1000
+        alpha = int(18 + 4 * math.sin(t * 0.5))
+        screen.blit(layers.veil((20, 15, 13, alpha)), (0, 0))
 
-    # HINT animé
-    if hint and hint_alpha > 0:
-        sr, sc, tr, tc = hint
+    with profiler.stage("animations_draw"):
+        for anim in animations:
+            anim.draw(screen)
 
-        t = pygame.time.get_ticks() / 1000
-        pulse = 0.5 + 0.5 * math.sin(4 * t)
 
-        a_src = int(hint_alpha * (0.7 + 0.3 * pulse))
-        a_trg = int(hint_alpha * (0.5 + 0.5 * pulse))
+def draw_stats_overlay(screen, font, stats: Optional[SearchStats]):
+    """Overlay de debug (F3) : statistiques de la dernière recherche de l'IA."""
+    lines = stats.summary_lines() if stats else ["Aucune recherche"]
+    line_h = font.get_linesize()
+    box = pygame.Surface((WIDTH, line_h * len(lines) + 8), pygame.SRCALPHA)
+    box.fill((0, 0, 0, 170))
+    for i, line in enumerate(lines):
+        box.blit(font.render(line, True, (230, 230, 230)), (8, 4 + i * line_h))
+    screen.blit(box, (0, OFFSET_Y))
 
-        # halo source
-        sx = sc * CELL
-        sy = offset_y + sr * CELL
-        surf = pygame.Surface((CELL, CELL), pygame.SRCALPHA)
-        pygame.draw.circle(surf, (0, 140, 255, a_src), (CELL // 2, CELL // 2), CELL // 2 - 6, 3)
-        screen.blit(surf, (sx, sy))
 
-        # halo cible
-        cx = tc * CELL + CELL // 2
-        cy = offset_y + tr * CELL + CELL // 2
-        pygame.draw.circle(screen, (0, 200, 255, a_trg), (cx, cy), 15, 3)
+# protège la liste des caches disque ouverts et le drapeau de fermeture
+_store_lock = threading.Lock()
 
-        # texte indicatif
-        lbl = font.render("Suggestion de coup (H)", True, (0, 190, 255))
-        screen.blit(lbl, (10, HEIGHT - 24))
 
-    if current_theme == NIGHT:
-        veil = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        t = pygame.time.get_ticks() / 1000
-        alpha = int(18 + 4 * math.sin(t * 0.5))
-        veil.fill((20, 15, 13, alpha))
-        screen.blit(veil, (0, 0))
+def _attach_position_store(holder: list, closing: threading.Event) -> None:
+    """Thread d'arrière-plan : ouverture et préchargement du cache disque."""
+    from position_store import PositionStore  # sqlite3 : hors du chemin du premier frame
 
-    for anim in animations:
-        anim.draw(screen)
+    store = PositionStore.open_default()
+    if store is None:
+        return
+    with _store_lock:
+        if closing.is_set():
+            # ouverture finie après la fin de la partie : rien n'a été enregistré,
+            # le thread d'écriture est arrêté ici puisque main() ne le verra pas
+            store.close()
+            return
+        holder.append(store)
+        analysis_cache.on_computed = store.record
+    store.load_into(analysis_cache)
 
 
-def main():
+def main(max_frames: Optional[int] = None):
+    """`max_frames` : quitte après ce nombre de frames (benchmarks de démarrage)."""
     global current_theme
+    # mise en page et réseau préparés ici, pas au chargement du module : le
+    # processus du conseil (hint.py, mode spawn) réimporte ce module sans les refaire
+    apply_layout()
+    # évaluation de l'IA : DAMES_RESEAU=reseau.npz (voir train_nnue.py), matérielle sinon
+    evaluator = load_network(os.environ.get("DAMES_RESEAU"))
     pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Jeu de Dames – Premium UI")
+    pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption(f"Jeu de Dames – Premium UI ({VARIANT.label})")
 
-    font = pygame.font.SysFont("segoe ui", 20)
+    # police par défaut au premier frame, « segoe ui » dès qu'elle est résolue
+    font = get_font(FONT_SIZE)
     clock = pygame.time.Clock()
 
-    engine = Engine()
-    ai = AI(engine, level=1)
+    # positions analysées lors des lancements précédents (DAMES_POSITIONS_DB= pour désactiver)
+    position_store: list = []
+    store_closing = threading.Event()
+    store_thread = threading.Thread(
+        target=_attach_position_store, args=(position_store, store_closing), name="position-store", daemon=True
+    )
+    store_thread.start()
+
+    engine = Engine(VARIANT)
+    show_stats = False
+    ai = AI(engine, level=1, collect_stats=show_stats, cache=analysis_cache, evaluator=evaluator, seed=FIXED_SEED)
+    print(f"Graine de l'IA : {ai.seed}")
     ai_plays = -1  # -1 = noirs, 1 = blancs
     animations: List[Animation] = [StartupFadeAnimation()]
     end_animation: Optional[EndGameAnimation] = None
+    # pulses, secousses, fondus et halos du conseil (voir effects.py)
+    effects = EffectLayer()
     tutorial = Tutorial()
     tutorial.start()
 
@@ -229,210 +295,296 @@ def main():
     last_move = None
 
     hint = None
-    hint_alpha = 0
+    hint_worker = HintWorker()
+    hint_candidates: List[Tuple[Move, float]] = []
 
     timer_white = 0.0
     timer_black = 0.0
+    increments = {1: 0.0, -1: 0.0}
+    ai_think = 0.0
 
     game_over = False
 
+    def clock_left(player: int) -> float:
+        """Temps restant à la pendule (mode cadencé uniquement)."""
+        base, _ = TIME_CONTROL
+        used = timer_white if player == 1 else timer_black
+        return base + increments[player] - used
+
     def reset_game():
-        nonlocal engine, ai, selected, moves, last_move, hint, hint_alpha, timer_white, timer_black, animations, end_animation, game_over
+        nonlocal engine, ai, selected, moves, last_move, hint, timer_white, timer_black, increments, animations, end_animation, game_over
         level = ai.level
-        engine = Engine()
-        ai = AI(engine, level=level)
+        engine = Engine(VARIANT)
+        ai = AI(
+            engine, level=level, collect_stats=show_stats, cache=analysis_cache, evaluator=evaluator, seed=FIXED_SEED
+        )
+        print(f"Graine de l'IA : {ai.seed}")
         selected = None
         moves = []
         last_move = None
         hint = None
-        hint_alpha = 0
+        effects.clear()
         timer_white = 0.0
         timer_black = 0.0
+        increments = {1: 0.0, -1: 0.0}
         animations = [StartupFadeAnimation()]
         end_animation = None
         game_over = False
 
+    # surface hors-écran à la taille du plateau, centrée dans la fenêtre
+    # quand celle-ci n'a pas exactement ses proportions
+    canvas: Optional[pygame.Surface] = None
+    pending_size: Optional[Tuple[int, int]] = None
+    pending_since = 0
+
+    def relayout(size: Tuple[int, int]) -> None:
+        nonlocal canvas, animations, end_animation
+        apply_layout(*size)
+        canvas = None
+        # les glissés en cours sont aux anciennes cotes : coupés (les effets,
+        # relatifs à la case, suivent la nouvelle taille)
+        kept: List[Animation] = []
+        if end_animation is not None:
+            end_animation = end_animation.resized((WIDTH, HEIGHT), UI_SCALE)
+            kept.append(end_animation)
+        animations = kept
+
+    def show_hint(move: Move) -> None:
+        effects.clear(HINT_HALO, HINT_TARGET_RING)
+        effects.add(HINT_HALO, (move.r, move.c), HINT_SOURCE)
+        effects.add(HINT_TARGET_RING, (move.r2, move.c2), HINT_TARGET)
+
+    def hide_hint() -> None:
+        nonlocal hint
+        hint = None
+        effects.clear(HINT_HALO, HINT_TARGET_RING)
+
     running = True
 
+    frame_count = 0
+
     while running:
         dt = clock.tick(FPS) / 1000.0
-
-        # update timers
+        profiler.begin_frame()
+        if pending_size is not None and pygame.time.get_ticks() - pending_since >= RESIZE_DEBOUNCE_MS:
+            relayout(pending_size)
+            pending_size = None
+        font = get_font(FONT_SIZE)
+        window = pygame.display.get_surface()
+        if window.get_size() == (WIDTH, HEIGHT):
+            screen = window
+        else:
+            if canvas is None:
+                canvas = pygame.Surface((WIDTH, HEIGHT))
+            screen = canvas
+        origin_x = (window.get_width() - WIDTH) // 2
+        origin_y = (window.get_height() - HEIGHT) // 2
+
+        # update timers (le temps de réflexion de l'IA est déjà imputé)
+        charged, ai_think = max(0.0, dt - ai_think), 0.0
         if not game_over and not tutorial.is_active():
             if engine.turn == 1:
-                timer_white += dt
+                timer_white += charged
             else:
-                timer_black += dt
-
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                running = False
-
-            elif tutorial.is_active():
-                tutorial.handle_event(e)
-                if e.type == pygame.KEYDOWN and e.key == pygame.K_n:
-                    current_theme = NIGHT if current_theme == DAY else DAY
-                    print("Night mode activé" if current_theme == NIGHT else "Day mode activé")
-                continue
-
-            elif e.type == pygame.KEYDOWN:
-                if e.key == pygame.K_h and not game_over:
-                    hint = engine.get_hint()
-                    if hint:
-                        hint_alpha = 255
-                elif e.key == pygame.K_n:
-                    current_theme = NIGHT if current_theme == DAY else DAY
-                    print("Night mode activé" if current_theme == NIGHT else "Day mode activé")
-                elif e.key == pygame.K_1:
-                    ai.level = 1
-                    print("IA niveau 1 actif")
-                elif e.key == pygame.K_2:
-                    ai.level = 2
-                    print("IA niveau 2 actif")
-                elif e.key == pygame.K_3:
-                    ai.level = 3
-                    print("IA niveau 3 actif")
-                elif e.key == pygame.K_r and game_over:
-                    reset_game()
-                elif e.key == pygame.K_t:
-                    tutorial.toggle()
-
-            elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
-                mx, my = e.pos
-
-                if end_animation and end_animation.button_rect and end_animation.button_rect.collidepoint(mx, my):
-                    reset_game()
+                timer_black += charged
+
+            if TIME_CONTROL and clock_left(engine.turn) <= 0:
+                winner = "Victoire des Blancs (temps)" if engine.turn == -1 else "Victoire des Noirs (temps)"
+                end_animation = EndGameAnimation(winner, (WIDTH, HEIGHT), current_theme["text"], scale=UI_SCALE)
+                animations.append(end_animation)
+                game_over = True
+
+        with profiler.stage("events"):
+            for e in pygame.event.get():
+                if e.type == pygame.QUIT:
+                    running = False
                     continue
 
-                if game_over:
+                if e.type == pygame.VIDEORESIZE:
+                    pending_size = e.size
+                    pending_since = pygame.time.get_ticks()
                     continue
 
-                if my < 50:
-                    continue  # ignore overlay
-
-                c = mx // CELL
-                r = (my - 50) // CELL
-                if not (0 <= r < 8 and 0 <= c < 8):
+                if tutorial.is_active():
+                    tutorial.handle_event(e)
+                    if e.type == pygame.KEYDOWN and e.key == pygame.K_n:
+                        current_theme = NIGHT if current_theme == DAY else DAY
+                        print("Night mode activé" if current_theme == NIGHT else "Day mode activé")
                     continue
 
-                piece = engine.board.grid[r][c]
-
-                if selected is None:
-                    if color(piece) == engine.turn:
-                        captures = engine._any_capture_available()
-                        if captures:
-                            caps = get_captures(engine.board, r, c)
-                            moves = [(r2, c2) for r2, c2, _, _ in caps]
+                elif e.type == pygame.KEYDOWN:
+                    if e.key == pygame.K_h and not game_over:
+                        # conseil de la recherche d'arrière-plan, sinon premier coup légal
+                        hint_candidates = hint_worker.candidates_for(engine)
+                        hint = hint_candidates[0][0] if hint_candidates else engine.get_hint()
+                        if hint:
+                            show_hint(hint)
+                    elif e.key == pygame.K_n:
+                        current_theme = NIGHT if current_theme == DAY else DAY
+                        print("Night mode activé" if current_theme == NIGHT else "Day mode activé")
+                    elif pygame.K_1 <= e.key <= pygame.K_9 and e.key - pygame.K_0 in LEVELS:
+                        ai.level = e.key - pygame.K_0
+                        profile = ai.profile
+                        print(f"IA niveau {ai.level} actif ({profile.name}, {profile.movetime:g} s max par coup)")
+                    elif e.key == pygame.K_r and game_over:
+                        reset_game()
+                    elif e.key == pygame.K_t:
+                        tutorial.toggle()
+                    elif e.key == pygame.K_F2:
+                        profiler.toggle()
+                        print("Profilage activé" if profiler.enabled else "Profilage désactivé")
+                    elif e.key == pygame.K_F4:
+                        profiler.dump_trace()
+                    elif e.key == pygame.K_F3:
+                        show_stats = not show_stats
+                        ai.collect_stats = show_stats
+                        print("Stats de recherche affichées" if show_stats else "Stats de recherche masquées")
+
+                elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+                    # coordonnées de la fenêtre -> coordonnées du plateau
+                    mx, my = e.pos[0] - origin_x, e.pos[1] - origin_y
+
+                    if end_animation and end_animation.button_rect and end_animation.button_rect.collidepoint(mx, my):
+                        reset_game()
+                        continue
+
+                    if game_over:
+                        continue
+
+                    if my < OFFSET_Y:
+                        continue  # ignore overlay
+
+                    c = mx // CELL
+                    r = (my - OFFSET_Y) // CELL
+                    if not (0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE):
+                        continue
+
+                    piece = engine.board.grid[r][c]
+
+                    if selected is None:
+                        if color(piece) == engine.turn:
+                            moves = engine.get_legal_moves(r, c)
+
+                            if moves:
+                                selected = (r, c)
+                                effects.add(SELECT_PULSE, (r, c), current_theme["text"])
+                                hide_hint()
+                            else:
+                                effects.add(SHAKE, (r, c))
                         else:
-                            moves = get_simple_moves(engine.board, r, c)
-
-                        if moves:
-                            selected = (r, c)
-                            pulse = SelectPulseAnimation((r, c), CELL, OFFSET_Y, current_theme["text"])
-                            animations.append(pulse)
-                            hint_alpha = 0
-                            hint = None
-                        else:
-                            animations.append(ShakeAnimation((r, c), SHAKE_AMPLITUDE))
+                            effects.add(SHAKE, (r, c))
                     else:
-                        animations.append(ShakeAnimation((r, c), SHAKE_AMPLITUDE))
-                else:
-                    if (r, c) in moves:
-                        piece_before = engine.board.grid[selected[0]][selected[1]]
-                        if engine.move_piece(selected[0], selected[1], r, c):
-                            piece_after = engine.board.grid[r][c]
-                            last_move = (selected[0], selected[1], r, c)
-                            move_anim = MoveAnimation(
-                                (selected[1], selected[0]), (c, r), piece_after,
-                                CELL, OFFSET_Y,
-                                current_theme,
-                                current_theme == NIGHT,
-                                font,
-                            )
-                            animations.append(move_anim)
-                            lastmove_anim = LastMoveFadeAnimation([
-                                (selected[1] * CELL, OFFSET_Y + selected[0] * CELL, CELL),
-                                (c * CELL, OFFSET_Y + r * CELL, CELL),
-                            ])
-                            animations.append(lastmove_anim)
-                            if abs(piece_before) == 1 and abs(piece_after) == 2:
-                                promo_anim = PromotionGlowAnimation((r, c), CELL, OFFSET_Y, current_theme["crown"])
-                                animations.append(promo_anim)
+                        if (r, c) in moves:
+                            piece_before = engine.board.grid[selected[0]][selected[1]]
+                            if engine.move_piece(selected[0], selected[1], r, c):
+                                if TIME_CONTROL:
+                                    increments[-engine.turn] += TIME_CONTROL[1]
+                                piece_after = engine.board.grid[r][c]
+                                last_move = (selected[0], selected[1], r, c)
+                                move_anim = MoveAnimation(
+                                    (selected[1], selected[0]), (c, r), piece_after,
+                                    CELL, OFFSET_Y,
+                                    current_theme,
+                                    current_theme == NIGHT,
+                                    font,
+                                )
+                                animations.append(move_anim)
+                                effects.add(LAST_MOVE, selected, LAST_MOVE_COLOR)
+                                effects.add(LAST_MOVE, (r, c), LAST_MOVE_COLOR)
+                                if abs(piece_before) == 1 and abs(piece_after) == 2:
+                                    effects.add(PROMOTION_GLOW, (r, c), current_theme["crown"])
+                                selected = None
+                                moves = []
+                                hide_hint()
+                            else:
+                                effects.add(SHAKE, (r, c))
+                        else:
+                            effects.add(SHAKE, (r, c))
                             selected = None
                             moves = []
-                            hint_alpha = 0
-                            hint = None
-                        else:
-                            animations.append(ShakeAnimation((r, c), SHAKE_AMPLITUDE))
-                    else:
-                        animations.append(ShakeAnimation((r, c), SHAKE_AMPLITUDE))
-                        selected = None
-                        moves = []
-
-        # fade du hint
-        if hint_alpha > 0 and not tutorial.is_active():
-            hint_alpha = max(0, hint_alpha - 120 * dt)
-
-        # update animations
-        for anim in animations[:]:
-            anim.update(dt)
-            if anim.finished:
-                animations.remove(anim)
-
-        # pulses de capture
-        active_capture_cells = capture_cells(engine) if not game_over else []
-        existing_capture = {a.cell for a in animations if isinstance(a, CapturePulseAnimation)}
+
+        # update animations (horloge commune des effets, fondu du conseil compris)
+        with profiler.stage("animations"):
+            for anim in animations[:]:
+                anim.update(dt)
+                if anim.finished:
+                    animations.remove(anim)
+            effects.advance(dt)
+            if hint is not None and not effects.active(HINT_HALO):
+                hint = None
+
+        # pulses de capture : déclarés, reconstruits seulement si les cases changent
+        with profiler.stage("capture_cells"):
+            active_capture_cells = capture_cells(engine) if not game_over else []
         accent_color = CAPTURE_PULSE_COLOR if current_theme != NIGHT else (120, 210, 190)
-        for cell in active_capture_cells:
-            if cell not in existing_capture:
-                animations.append(CapturePulseAnimation(cell, CELL, OFFSET_Y, accent_color))
-        for anim in animations:
-            if isinstance(anim, CapturePulseAnimation) and anim.cell not in active_capture_cells:
-                anim.finished = True
+        effects.set_cells(CAPTURE_PULSE, active_capture_cells, accent_color)
 
         # tour de l'IA
         if not game_over and not tutorial.is_active() and engine.turn == ai_plays and has_legal_moves(engine):
-            move = ai.choose_move()
+            think_start = pygame.time.get_ticks()
+            with profiler.stage("ai"):
+                if TIME_CONTROL:
+                    move = ai.choose_move(clock_left(ai_plays), TIME_CONTROL[1])
+                else:
+                    move = ai.choose_move()
+            ai_think = (pygame.time.get_ticks() - think_start) / 1000.0
+            if ai_plays == 1:
+                timer_white += ai_think
+            else:
+                timer_black += ai_think
+            if show_stats and ai.last_stats:
+                print("[IA] " + " | ".join(ai.last_stats.summary_lines()))
             if move:
-                r, c, r2, c2 = move
-                piece_before = engine.board.grid[r][c]
-                if engine.move_piece(r, c, r2, c2):
-                    piece_after = engine.board.grid[r2][c2]
-                    last_move = (r, c, r2, c2)
-                    move_anim = MoveAnimation(
-                        (c, r), (c2, r2), piece_after,
-                        CELL, OFFSET_Y,
-                        current_theme,
-                        current_theme == NIGHT,
-                        font,
-                    )
-                    animations.append(move_anim)
-                    lastmove_anim = LastMoveFadeAnimation([
-                        (c * CELL, OFFSET_Y + r * CELL, CELL),
-                        (c2 * CELL, OFFSET_Y + r2 * CELL, CELL),
-                    ])
-                    animations.append(lastmove_anim)
-                    if abs(piece_before) == 1 and abs(piece_after) == 2:
-                        promo_anim = PromotionGlowAnimation(
-                            (r2, c2), CELL, OFFSET_Y, current_theme["crown"]
-                        )
-                        animations.append(promo_anim)
+                # coup issu de la génération de l'IA : joué tel quel, rafle comprise
+                r, c, r2, c2 = move.as_tuple()
+                engine.play(move)
+                if TIME_CONTROL:
+                    increments[ai_plays] += TIME_CONTROL[1]
+                piece_after = engine.board.grid[r2][c2]
+                last_move = (r, c, r2, c2)
+                move_anim = MoveAnimation(
+                    (c, r), (c2, r2), piece_after,
+                    CELL, OFFSET_Y,
+                    current_theme,
+                    current_theme == NIGHT,
+                    font,
+                )
+                animations.append(move_anim)
+                effects.add(LAST_MOVE, (r, c), LAST_MOVE_COLOR)
+                effects.add(LAST_MOVE, (r2, c2), LAST_MOVE_COLOR)
+                if move.promotion:
+                    effects.add(PROMOTION_GLOW, (r2, c2), current_theme["crown"])
             selected = None
             moves = []
-            hint = None
-            hint_alpha = 0
+            hide_hint()
 
         # détection fin de partie
-        if not game_over and not has_legal_moves(engine):
-            winner = "Victoire des Blancs" if engine.turn == -1 else "Victoire des Noirs"
-            end_animation = EndGameAnimation(winner, (WIDTH, HEIGHT), current_theme["text"])
+        with profiler.stage("has_legal_moves"):
+            no_moves = not game_over and not has_legal_moves(engine)
+        draw = engine.draw_reason() if not game_over else None
+        if no_moves or draw:
+            if draw:
+                winner = f"Partie nulle ({draw})"
+            else:
+                winner = "Victoire des Blancs" if engine.turn == -1 else "Victoire des Noirs"
+            end_animation = EndGameAnimation(winner, (WIDTH, HEIGHT), current_theme["text"], scale=UI_SCALE)
             animations.append(end_animation)
             game_over = True
 
-        shake_offsets = {}
-        for anim in animations:
-            if isinstance(anim, ShakeAnimation):
-                shake_offsets[anim.cell] = anim.offset()
+        # conseil (H) cherché en arrière-plan pendant la réflexion du joueur
+        # lancé après le premier frame : le worker n'en retarde pas l'affichage
+        hint_worker.follow(
+            engine, frame_count > 0 and not game_over and not tutorial.is_active() and engine.turn != ai_plays
+        )
+        if hint is not None:
+            # conseil affiché : il s'affine tant que la recherche progresse
+            fresh = hint_worker.candidates_for(engine)
+            if fresh:
+                hint_candidates = fresh
+                if fresh[0][0] != hint:
+                    hint = fresh[0][0]
+                    effects.replace(HINT_HALO, (hint.r, hint.c))
+                    effects.replace(HINT_TARGET_RING, (hint.r2, hint.c2))
 
         moving_targets = {
             (anim.end_cell[1], anim.end_cell[0])
@@ -440,25 +592,56 @@ def main():
             if isinstance(anim, MoveAnimation) and not anim.finished
         }
 
-        draw_board(
-            screen,
-            engine,
-            selected,
-            moves,
-            hint,
-            hint_alpha,
-            font,
-            timer_white,
-            timer_black,
-            animations,
-            moving_targets,
-            shake_offsets,
-        )
+        with profiler.stage("draw_board"):
+            draw_board(
+                screen,
+                engine,
+                selected,
+                moves,
+                hint,
+                font,
+                max(0.0, clock_left(1)) if TIME_CONTROL else timer_white,
+                max(0.0, clock_left(-1)) if TIME_CONTROL else timer_black,
+                animations,
+                moving_targets,
+                effects,
+                hint_candidates,
+            )
+
+        if show_stats:
+            draw_stats_overlay(screen, font, ai.last_stats)
 
         if tutorial.is_active():
-            tutorial.draw(screen, font, current_theme)
+            with profiler.stage("tutorial"):
+                tutorial.draw(screen, font, current_theme)
+
+        profiler.draw(screen, font, OFFSET_Y)
+
+        if screen is not window:
+            window.fill(current_theme["bg"])
+            window.blit(screen, (origin_x, origin_y))
+
+        with profiler.stage("flip"):
+            pygame.display.flip()
+
+        profiler.end_frame(dt)
+
+        frame_count += 1
+        if max_frames is not None and frame_count >= max_frames:
+            running = False
+
+    if profiler.enabled and os.environ.get("DAMES_PROFILE_TRACE"):
+        profiler.dump_trace()
 
-        pygame.display.flip()
+    hint_worker.close()
+    store_thread.join(timeout=2.0)
+    # un cache encore en cours d'ouverture sera fermé par son thread
+    with _store_lock:
+        store_closing.set()
+        analysis_cache.on_computed = None
+        stores = list(position_store)
+    for store in stores:
+        store.close()
 
     pygame.quit()
 
@@ -0,0 +1,106 @@
+# nnue.py : évaluation par petit réseau dense, accumulateur incrémental (NumPy)
+"""
+Réseau « à la NNUE » : entrées creuses (une par couple pièce / case), une
+première couche dont la sortie, l'accumulateur, est tenue à jour coup par
+coup, puis deux petites couches denses.
+
+    entrées (4 x taille²) -> H1 (ReLU bornée) -> H2 (ReLU bornée) -> score
+
+Un coup ne change que quelques entrées (départ, arrivée, pièces prises) :
+l'accumulateur de l'enfant vaut celui du parent plus ou moins quelques
+lignes de W1, et une évaluation à la feuille ne coûte que quelques
+opérations vectorielles. Le score est du point de vue des Blancs, en points
+de matériel comme `MaterialEvaluator` (cible d'entraînement à la même
+échelle, voir train_nnue.py).
+
+Poids dans un fichier `.npz` (w1, b1, w2, b2, w3, b3, size). NumPy est
+requis ici seulement : `engine` et `ai` s'importent sans.
+"""
+import hashlib
+from typing import List
+
+import numpy as np
+
+from ai import Evaluator
+from engine import Board, Move
+
+# Plan d'entrée de chaque type de pièce
+PLANES = {1: 0, 2: 1, -1: 2, -2: 3}
+
+
+def feature_indices(board: Board) -> List[int]:
+    """Entrées actives de la position (une par pièce présente)."""
+    size = board.size
+    area = size * size
+    grid = board.grid
+    return [
+        PLANES[grid[r][c]] * area + r * size + c
+        for col in (1, -1)
+        for r, c in board.pieces[col]
+    ]
+
+
+class NetworkEvaluator(Evaluator):
+    incremental = True
+
+    def __init__(
+        self, w1: np.ndarray, b1: np.ndarray, w2: np.ndarray, b2: np.ndarray, w3: np.ndarray, b3: float, size: int
+    ) -> None:
+        self.size = size
+        self.w1 = np.asarray(w1, dtype=np.float32)  # (entrées, H1)
+        self.b1 = np.asarray(b1, dtype=np.float32)
+        self.w2 = np.asarray(w2, dtype=np.float32)  # (H2, H1)
+        self.b2 = np.asarray(b2, dtype=np.float32)
+        self.w3 = np.asarray(w3, dtype=np.float32)  # (H2,)
+        self.b3 = float(b3)
+        if self.w1.shape[0] != 4 * size * size:
+            raise ValueError(f"W1 a {self.w1.shape[0]} entrées, {4 * size * size} attendues pour {size}x{size}")
+        # début de chaque plan dans W1, pour les mises à jour incrémentales
+        self._plane_base = {piece: plane * size * size for piece, plane in PLANES.items()}
+        # les clés de cache distinguent les jeux de poids
+        digest = hashlib.sha1()
+        for array in (self.w1, self.b1, self.w2, self.b2, self.w3):
+            digest.update(array.tobytes())
+        self.name = f"reseau-{digest.hexdigest()[:12]}"
+
+    @classmethod
+    def load(cls, path: str) -> "NetworkEvaluator":
+        with np.load(path) as data:
+            return cls(
+                data["w1"], data["b1"], data["w2"], data["b2"], data["w3"], float(data["b3"]), int(data["size"])
+            )
+
+    def save(self, path: str) -> None:
+        np.savez(
+            path, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2, w3=self.w3, b3=np.float32(self.b3), size=self.size
+        )
+
+    def refresh(self, board: Board) -> np.ndarray:
+        """Accumulateur calculé depuis zéro (racine de la recherche)."""
+        return self.b1 + self.w1[feature_indices(board)].sum(axis=0)
+
+    def push(self, parent: Board, child: Board, move: Move) -> None:
+        acc = parent.accumulator
+        if acc is None:
+            acc = parent.accumulator = self.refresh(parent)
+        grid = parent.grid
+        size = self.size
+        base = self._plane_base
+        w1 = self.w1
+        piece = grid[move.r][move.c]
+        landed = 2 * piece if move.promotion else piece
+        acc = acc - w1[base[piece] + move.r * size + move.c] + w1[base[landed] + move.r2 * size + move.c2]
+        for mr, mc in move.captures:
+            acc -= w1[base[grid[mr][mc]] + mr * size + mc]
+        child.accumulator = acc
+
+    def forward(self, acc: np.ndarray) -> float:
+        hidden = np.clip(acc, 0.0, 1.0)
+        hidden = np.clip(self.w2 @ hidden + self.b2, 0.0, 1.0)
+        return float(self.w3 @ hidden) + self.b3
+
+    def evaluate(self, board: Board, col: int) -> float:
+        acc = board.accumulator
+        if acc is None:
+            acc = board.accumulator = self.refresh(board)
+        return self.forward(acc) * col
@@ -0,0 +1,186 @@
+# position_store.py : cache persistant des positions analysées (SQLite)
+"""
+Garde sur disque les résultats de recherche (meilleur coup, score) indexés
+par hash de position compact, pour qu'un nouveau lancement ne reparte pas
+d'une IA « froide ».
+
+- écritures regroupées par lots (`batch_size`) et faites par un thread
+  dédié : `record` ne touche jamais au disque, le thread de l'interface qui
+  l'appelle ne bloque pas sur SQLite ; le reste est écrit à la fermeture ;
+- taille bornée (`max_rows`) : un compte de lignes tenu à jour évite un
+  COUNT(*) par lot, et la purge des entrées les plus anciennes descend sous
+  `PURGE_RATIO` de la limite pour rester rare ;
+- préchargement dans un `AnalysisCache` au démarrage (main.py le fait
+  dans un thread d'arrière-plan).
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Hashable, List, Optional, Tuple
+
+from analysis_cache import AnalysisCache
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "jeudedames", "positions.sqlite3")
+
+# Après une purge, la table est ramenée à cette fraction de `max_rows`
+PURGE_RATIO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    key INTEGER NOT NULL,
+    settings TEXT NOT NULL,
+    move TEXT,
+    score REAL,
+    PRIMARY KEY (key, settings)
+)
+"""
+
+
+def _to_signed(key: int) -> int:
+    # SQLite stocke des entiers signés 64 bits
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+def _to_unsigned(key: int) -> int:
+    return key + (1 << 64) if key < 0 else key
+
+
+class PositionStore:
+    def __init__(self, path: str = DEFAULT_PATH, max_rows: int = 500_000, batch_size: int = 256) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+        self._pending: List[Tuple[int, str, Optional[str], float]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        # la connexion n'est utilisée que par un thread à la fois
+        self._write_lock = threading.Lock()
+        self._closed = False
+        # nombre de lignes de la table, majoré : REPLACE n'en ajoute pas toujours
+        self._rows: Optional[int] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = self._connect()
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._writer = threading.Thread(target=self._write_loop, name="position-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=67108864")
+        return conn
+
+    @classmethod
+    def open_default(cls) -> Optional["PositionStore"]:
+        """Ouvre le cache du joueur ; None si le disque n'est pas utilisable."""
+        path = os.environ.get("DAMES_POSITIONS_DB", DEFAULT_PATH)
+        if not path:
+            return None
+        try:
+            return cls(path)
+        except (OSError, sqlite3.Error) as exc:
+            print(f"Cache de positions désactivé : {exc}")
+            return None
+
+    # --- Écriture ---
+    def record(self, key: Hashable, value: Any) -> None:
+        """Ajoute un résultat (clé de AnalysisCache, (coup, score)) au lot en attente."""
+        pos_key, settings = key
+        move, score = value
+        row = (
+            _to_signed(pos_key),
+            json.dumps(list(settings)),
+            json.dumps(list(move)) if move is not None else None,
+            float(score),
+        )
+        with self._wake:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._wake.notify()
+
+    def flush(self) -> None:
+        """Écrit tout de suite le lot en attente (dans le thread appelant)."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        self._write(rows)
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._wake:
+                while len(self._pending) < self.batch_size and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                rows, self._pending = self._pending, []
+            self._write(rows)
+
+    def _write(self, rows: List[Tuple[int, str, Optional[str], float]]) -> None:
+        if not rows:
+            return
+        with self._write_lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO positions (key, settings, move, score) VALUES (?, ?, ?, ?)",
+                        rows,
+                    )
+                    if self._rows is None:
+                        self._rows = self._count()
+                    else:
+                        self._rows += len(rows)
+                    if self._rows > self.max_rows:
+                        self._purge()
+            except sqlite3.Error as exc:
+                self._rows = None
+                print(f"Cache de positions : écriture impossible ({exc})")
+
+    def _count(self) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM positions").fetchone()
+        return count
+
+    def _purge(self) -> None:
+        # le compte tenu à jour est majoré : on vérifie avant d'effacer
+        self._rows = self._count()
+        if self._rows <= self.max_rows:
+            return
+        keep = int(self.max_rows * PURGE_RATIO)
+        # REPLACE réinsère : les rowid les plus petits sont les plus anciens
+        self._conn.execute(
+            "DELETE FROM positions WHERE rowid IN (SELECT rowid FROM positions ORDER BY rowid LIMIT ?)",
+            (self._rows - keep,),
+        )
+        self._rows = keep
+
+    # --- Lecture ---
+    def load_into(self, cache: AnalysisCache, limit: Optional[int] = None) -> int:
+        """Charge les entrées les plus récentes dans `cache` ; retourne leur nombre."""
+        limit = limit if limit is not None else cache.max_entries
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT key, settings, move, score FROM positions ORDER BY rowid DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        except sqlite3.Error as exc:
+            print(f"Cache de positions : lecture impossible ({exc})")
+            return 0
+        finally:
+            conn.close()
+        # du plus ancien au plus récent pour respecter l'ordre LRU
+        for key, settings, move, score in reversed(rows):
+            value = (tuple(json.loads(move)) if move is not None else None, score)
+            cache.put((_to_unsigned(key), tuple(json.loads(settings))), value)
+        return len(rows)
+
+    def close(self) -> None:
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
+        self._writer.join()
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,195 @@
+# profiler.py : chronométrage des étapes de la boucle principale
+"""
+Mode profilage de main.py (touche F2 ou variable DAMES_PROFILE=1).
+
+Chaque frame est découpée en étapes nommées (`with profiler.stage("ai"):`).
+Le profiler garde une fenêtre glissante des temps de frame (p50/p95/p99,
+frames perdues), dessine un petit overlay, logge les dépassements de budget
+dans la console et peut écrire une trace au format Chrome (chrome://tracing,
+Perfetto) pour une analyse hors-ligne.
+"""
+import json
+import os
+from collections import deque
+from time import perf_counter
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pygame
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, profiler: "FrameProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.start, perf_counter())
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, fps: int, window: int = 300, trace_events: int = 50000, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.budget_ms = 1000.0 / fps
+        self.frame_ms: Deque[float] = deque(maxlen=window)
+        self.work_ms: Deque[float] = deque(maxlen=window)
+        self.stage_ms: Dict[str, Deque[float]] = {}
+        self.dropped = 0
+        self.frame_count = 0
+        self._trace: Deque[Tuple[str, float, float]] = deque(maxlen=trace_events)
+        self._stages: Dict[str, _Stage] = {}
+        self._current: Dict[str, float] = {}
+        self._frame_start = 0.0
+        self._origin = perf_counter()
+
+    @classmethod
+    def from_env(cls, fps: int) -> "FrameProfiler":
+        return cls(fps, enabled=os.environ.get("DAMES_PROFILE", "") not in ("", "0"))
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        self.reset()
+
+    def reset(self) -> None:
+        self.frame_ms.clear()
+        self.work_ms.clear()
+        self.stage_ms.clear()
+        self.dropped = 0
+        self.frame_count = 0
+        self._frame_start = 0.0
+
+    # Mesures
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_STAGE
+        st = self._stages.get(name)
+        if st is None:
+            st = self._stages[name] = _Stage(self, name)
+        return st
+
+    def _record(self, name: str, start: float, end: float) -> None:
+        self._current[name] = self._current.get(name, 0.0) + (end - start) * 1000
+        self._trace.append((name, start, end))
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            return
+        self._current.clear()
+        self._frame_start = perf_counter()
+
+    def end_frame(self, dt: float) -> None:
+        """`dt` : intervalle entre deux frames (retour de clock.tick), en secondes."""
+        if not self.enabled or not self._frame_start:
+            # activé en cours de frame : la mesure commence à la suivante
+            return
+        end = perf_counter()
+        work = (end - self._frame_start) * 1000
+        self._trace.append(("frame", self._frame_start, end))
+        self.frame_count += 1
+        self.frame_ms.append(dt * 1000)
+        self.work_ms.append(work)
+        if dt * 1000 > self.budget_ms * 1.5:
+            self.dropped += 1
+        for name, ms in self._current.items():
+            hist = self.stage_ms.get(name)
+            if hist is None:
+                hist = self.stage_ms[name] = deque(maxlen=self.frame_ms.maxlen)
+            hist.append(ms)
+        if work > self.budget_ms:
+            worst = max(self._current.items(), key=lambda kv: kv[1], default=("?", 0.0))
+            print(
+                f"[profil] frame {self.frame_count} : {work:.1f} ms > budget {self.budget_ms:.1f} ms "
+                f"(pire étape : {worst[0]} {worst[1]:.1f} ms)",
+                flush=True,
+            )
+
+    # Statistiques
+    @staticmethod
+    def percentile(values: List[float], q: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        idx = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[idx]
+
+    def frame_percentiles(self) -> Tuple[float, float, float]:
+        values = list(self.frame_ms)
+        return (
+            self.percentile(values, 0.50),
+            self.percentile(values, 0.95),
+            self.percentile(values, 0.99),
+        )
+
+    def summary_lines(self) -> List[str]:
+        p50, p95, p99 = self.frame_percentiles()
+        lines = [
+            f"frame p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f} ms",
+            f"perdues {self.dropped}/{self.frame_count}  budget {self.budget_ms:.1f} ms",
+        ]
+        for name, hist in sorted(self.stage_ms.items(), key=lambda kv: -sum(kv[1])):
+            lines.append(f"{name:<14} {sum(hist) / len(hist):6.2f} ms  max {max(hist):6.2f}")
+        return lines
+
+    # Rendu
+    def draw(self, screen: pygame.Surface, font: pygame.font.Font, top: int = 0) -> None:
+        """Overlay en haut à droite, sous `top` (hauteur de la barre supérieure)."""
+        if not self.enabled:
+            return
+        lines = self.summary_lines()
+        line_h = font.get_linesize()
+        graph_h = 40
+        width = 300
+        height = line_h * len(lines) + graph_h + 12
+        box = pygame.Surface((width, height), pygame.SRCALPHA)
+        box.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            box.blit(font.render(line, True, (230, 230, 230)), (6, 4 + i * line_h))
+
+        # histogramme glissant des dernières frames
+        base_y = height - 4
+        scale = graph_h / (self.budget_ms * 2)
+        values = list(self.frame_ms)[-(width - 12):]
+        for x, ms in enumerate(values):
+            col = (90, 220, 120) if ms <= self.budget_ms * 1.5 else (240, 90, 70)
+            bar = min(graph_h, int(ms * scale))
+            pygame.draw.line(box, col, (6 + x, base_y), (6 + x, base_y - bar))
+        budget_y = base_y - int(self.budget_ms * scale)
+        pygame.draw.line(box, (255, 255, 255, 120), (6, budget_y), (width - 6, budget_y))
+
+        screen.blit(box, (screen.get_width() - width, top))
+
+    # Trace
+    def dump_trace(self, path: Optional[str] = None) -> str:
+        """Écrit les derniers événements au format Chrome Trace Event."""
+        path = path or os.environ.get("DAMES_PROFILE_TRACE", "trace_dames.json")
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": 0,
+                "tid": 0,
+            }
+            for name, start, end in self._trace
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"[profil] trace écrite : {path} ({len(events)} événements)", flush=True)
+        return path
@@ -0,0 +1,464 @@
+# server.py : serveur multi-parties sans interface (asyncio, JSON lines)
+"""
+Un seul processus héberge de nombreuses parties `Engine` en parallèle.
+
+Protocole : une requête JSON par ligne, une réponse JSON par ligne.
+
+    {"id": 1, "op": "new", "level": 3, "ai_color": -1, "variant": "internationale"}
+    {"id": 2, "op": "move", "session": "s1", "move": [5, 0, 4, 1]}
+    {"id": 3, "op": "ai", "session": "s1"}          # l'IA joue pour le camp au trait
+    {"id": 4, "op": "state", "session": "s1"}
+    {"id": 5, "op": "close", "session": "s1"}
+    {"id": 6, "op": "stats"}
+
+`variant` (facultatif) : classique, anglaise, bresilienne ou internationale.
+`level` (facultatif, 3 par défaut) : niveau de l'IA, de 1 à 6 (ai.LEVELS) ;
+chaque niveau a une latence maximale par coup (`movetime` de son profil).
+`seed` (facultatif, tirée au hasard sinon, renvoyée dans l'état) : graine
+de l'IA de la session ; à graine égale, une partie se rejoue à l'identique.
+Réponses : {"id": ..., "ok": true, ...} ou {"id": ..., "ok": false, "error": "..."}.
+Après un coup joué dans une session avec `ai_color`, la réponse de l'IA est
+calculée et renvoyée dans le champ « reply ». Le champ « draw » de l'état
+donne le motif d'une partie nulle (répétition, absence de progrès) : plus
+aucun coup n'est alors accepté.
+
+Les recherches de l'IA passent par un pool de workers borné partagé, avec
+une file équitable (round-robin) entre parties : une partie n'a jamais plus
+d'une recherche en cours, et une partie très active ne peut pas affamer les
+autres. Le serveur n'écoute qu'en local.
+
+Une session appartient à la connexion qui l'a créée : elle est fermée quand
+le client se déconnecte, même sans `close`. Sa limite mémoire porte sur une
+estimation (taille fixe + taille par coup d'historique + recherche en cours),
+pas sur une mesure.
+
+    python3 server.py --port 8765 --workers 4
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from ai import AI, SearchPool, get_level
+from analysis_cache import AnalysisCache
+from engine import Engine, MoveTuple, Variant, get_variant, position_key
+
+Grid = List[List[int]]
+
+# Estimation grossière de l'empreinte d'une session (octets), non mesurée :
+# la limite mémoire d'une session porte sur cette estimation, pas sur
+# l'occupation réelle du processus
+SESSION_BASE_BYTES = 2048
+HISTORY_ENTRY_BYTES = 120
+PENDING_JOB_BYTES = 1024
+
+
+class ProtocolError(Exception):
+    """Requête invalide : renvoyée au client sous forme d'erreur."""
+
+
+# un pool de recherche par thread de worker, réutilisé d'une recherche à
+# l'autre : la mémoire d'un worker reste stable sur des milliers de parties
+_worker = threading.local()
+
+
+def _worker_pool() -> SearchPool:
+    pool = getattr(_worker, "pool", None)
+    if pool is None:
+        pool = _worker.pool = SearchPool()
+    return pool
+
+
+def _search_job(
+    variant: str,
+    grid: Grid,
+    turn: int,
+    history: Tuple[int, Dict[int, int]],
+    level: int,
+    time_left: Optional[float],
+    increment: float,
+    seed: int,
+) -> Tuple[Optional[Tuple[int, ...]], bool]:
+    """
+    Recherche exécutée dans un worker : données simples, sérialisables.
+    Rend (coup au format `Move.as_compact`, terminée) : faux si l'horloge a
+    coupé la recherche.
+    """
+    engine = Engine(get_variant(variant))
+    engine.set_position(grid, turn, *history)
+    ai = AI(engine, level=level, seed=seed, pool=_worker_pool())
+    move = ai.choose_move(time_left, increment)
+    return (move.as_compact() if move is not None else None), ai.last_complete
+
+
+class Session:
+    def __init__(
+        self,
+        session_id: str,
+        level: int,
+        ai_color: Optional[int],
+        max_bytes: int,
+        variant: Optional[Variant] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.id = session_id
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        self.engine = Engine(variant)
+        self.level = level
+        self.ai_color = ai_color
+        self.max_bytes = max_bytes
+        self.history: List[MoveTuple] = []
+        self.pending = 0
+        self.lock = asyncio.Lock()
+
+    def memory_estimate(self) -> int:
+        return (
+            SESSION_BASE_BYTES
+            + len(self.history) * HISTORY_ENTRY_BYTES
+            + self.pending * PENDING_JOB_BYTES
+        )
+
+    def check_memory(self) -> None:
+        if self.memory_estimate() > self.max_bytes:
+            raise ProtocolError(f"limite mémoire de la session {self.id} atteinte ({self.max_bytes} octets)")
+
+    def play(self, move: Tuple[int, ...]) -> None:
+        """Joue (r, c, r2, c2), ou un coup au format `Move.as_compact` (rafle précise)."""
+        self.check_memory()
+        draw = self.engine.draw_reason()
+        if draw is not None:
+            raise ProtocolError(f"partie nulle ({draw})")
+        for legal in self.engine.legal_moves_from(move[0], move[1]):
+            if legal.matches(move):
+                self.engine.play(legal)
+                break
+        else:
+            raise ProtocolError(f"coup illégal : {list(move)}")
+        self.history.append(legal.as_tuple())
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "session": self.id,
+            "turn": self.engine.turn,
+            "grid": self.engine.board.grid,
+            "plies": len(self.history),
+            "draw": self.engine.draw_reason(),
+            "level": self.level,
+            "ai_color": self.ai_color,
+            "variant": self.engine.variant.name,
+            "seed": self.seed,
+        }
+
+
+class FairScheduler:
+    """
+    Pool de workers borné partagé par toutes les sessions. Les travaux sont
+    rangés par session et servis en round-robin, au plus `workers` à la fois.
+    """
+
+    def __init__(self, executor: Executor, workers: int) -> None:
+        self.executor = executor
+        self.workers = workers
+        self.queues: Dict[str, Deque[Tuple[tuple, asyncio.Future]]] = {}
+        self.ring: Deque[str] = deque()
+        self.running = 0
+        self.completed = 0
+
+    def submit(self, session_id: str, args: tuple) -> "asyncio.Future":
+        future = asyncio.get_running_loop().create_future()
+        queue = self.queues.get(session_id)
+        if queue is None:
+            queue = self.queues[session_id] = deque()
+            self.ring.append(session_id)
+        queue.append((args, future))
+        self._dispatch()
+        return future
+
+    def queued(self) -> int:
+        return sum(len(q) for q in self.queues.values())
+
+    def _dispatch(self) -> None:
+        while self.running < self.workers and self.ring:
+            session_id = self.ring.popleft()
+            queue = self.queues[session_id]
+            args, future = queue.popleft()
+            if queue:
+                self.ring.append(session_id)
+            else:
+                del self.queues[session_id]
+            self.running += 1
+            task = asyncio.get_running_loop().run_in_executor(self.executor, _search_job, *args)
+            task.add_done_callback(lambda t, f=future: self._done(t, f))
+
+    def _done(self, task: "asyncio.Future", future: "asyncio.Future") -> None:
+        self.running -= 1
+        self.completed += 1
+        if task.cancelled():
+            future.cancel()
+        elif not future.cancelled():
+            if task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+        self._dispatch()
+
+
+class DamesServer:
+    def __init__(
+        self,
+        workers: int = os.cpu_count() or 1,
+        max_sessions: int = 1000,
+        session_max_bytes: int = 256 * 1024,
+        use_processes: bool = True,
+        cache: Optional[AnalysisCache] = None,
+    ) -> None:
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = pool_cls(max_workers=workers)
+        self.scheduler = FairScheduler(self.executor, workers)
+        self.cache = cache if cache is not None else AnalysisCache()
+        self.sessions: Dict[str, Session] = {}
+        self.max_sessions = max_sessions
+        self.session_max_bytes = session_max_bytes
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # --- Réseau ---
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        if host not in ("127.0.0.1", "localhost", "::1"):
+            raise ValueError("le serveur n'écoute qu'en local")
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # sessions ouvertes par cette connexion, fermées à la déconnexion
+        owned: Set[str] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response: Dict[str, Any] = {"ok": False, "error": "JSON invalide"}
+                else:
+                    response = await self.handle_request(request)
+                    if response.get("ok") and request.get("op") == "new":
+                        owned.add(response["session"])
+                    elif response.get("ok") and request.get("op") == "close":
+                        owned.discard(response["session"])
+                writer.write((json.dumps(response) + "\n").encode("utf-8"))
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # client parti ou serveur arrêté : fin silencieuse de la connexion
+            pass
+        finally:
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+            writer.close()
+
+    # --- Requêtes ---
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            return {"id": None, "ok": False, "error": "la requête doit être un objet JSON"}
+        req_id = request.get("id")
+        try:
+            handler = getattr(self, f"_op_{request.get('op')}", None)
+            if handler is None:
+                raise ProtocolError(f"opération inconnue : {request.get('op')!r}")
+            result = await handler(request)
+            result.update({"id": req_id, "ok": True})
+            return result
+        except ProtocolError as exc:
+            return {"id": req_id, "ok": False, "error": str(exc)}
+        except (TypeError, ValueError) as exc:
+            return {"id": req_id, "ok": False, "error": f"paramètre invalide : {exc}"}
+        except Exception as exc:
+            # une requête ne doit jamais couper la connexion ni le serveur
+            print(f"erreur interne sur {request.get('op')!r} : {exc!r}", file=sys.stderr)
+            return {"id": req_id, "ok": False, "error": f"erreur interne : {type(exc).__name__}"}
+
+    def _session(self, request: Dict[str, Any]) -> Session:
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            raise ProtocolError(f"session inconnue : {request.get('session')!r}")
+        return session
+
+    async def _op_new(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if len(self.sessions) >= self.max_sessions:
+            raise ProtocolError("nombre maximal de sessions atteint")
+        ai_color = request.get("ai_color")
+        if ai_color not in (None, 1, -1):
+            raise ProtocolError("ai_color doit valoir 1, -1 ou null")
+        try:
+            variant = get_variant(request.get("variant"))
+        except ValueError as exc:
+            raise ProtocolError(str(exc)) from None
+        seed = request.get("seed")
+        if seed is not None and not isinstance(seed, int):
+            raise ProtocolError("seed doit être un entier")
+        level = request.get("level", 3)
+        # bool est un int pour Python, mais pas un niveau
+        if isinstance(level, bool) or not isinstance(level, int):
+            raise ProtocolError("level doit être un entier de 1 à 6")
+        try:
+            level = get_level(level).number
+        except ValueError as exc:
+            raise ProtocolError(str(exc)) from None
+        session = Session(f"s{next(self._ids)}", level, ai_color, self.session_max_bytes, variant, seed)
+        self.sessions[session.id] = session
+        result = session.state()
+        if ai_color == session.engine.turn:
+            async with session.lock:
+                result["reply"] = await self._ai_play(session)
+        return result
+
+    async def _op_move(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        session = self._session(request)
+        move = request.get("move")
+        size = session.engine.variant.size
+        if (
+            not isinstance(move, list)
+            or len(move) != 4
+            or not all(type(v) is int and 0 <= v < size for v in move)
+        ):
+            raise ProtocolError(f"move doit être [r, c, r2, c2], entiers de 0 à {size - 1}")
+        async with session.lock:
+            if session.ai_color == session.engine.turn:
+                raise ProtocolError("c'est au tour de l'IA")
+            session.play(tuple(move))
+            result = session.state()
+            if session.ai_color == session.engine.turn:
+                result["reply"] = await self._ai_play(session)
+                result.update(session.state())
+        return result
+
+    async def _op_ai(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        session = self._session(request)
+        time_left = request.get("time_left")
+        if time_left is not None:
+            # validé ici : une erreur dans le worker coûterait une place du pool
+            if isinstance(time_left, bool) or not isinstance(time_left, (int, float)):
+                raise ProtocolError("time_left doit être un nombre de secondes ou null")
+            time_left = float(time_left)
+            if not math.isfinite(time_left) or time_left < 0:
+                raise ProtocolError("time_left doit être fini et positif ou nul")
+        async with session.lock:
+            reply = await self._ai_play(session, time_left, float(request.get("increment", 0.0)))
+            result = session.state()
+        result["reply"] = reply
+        return result
+
+    async def _op_state(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return self._session(request).state()
+
+    async def _op_close(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        session = self._session(request)
+        del self.sessions[session.id]
+        return {"session": session.id}
+
+    async def _op_stats(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "sessions": len(self.sessions),
+            "workers": self.scheduler.workers,
+            "running": self.scheduler.running,
+            "queued": self.scheduler.queued(),
+            "completed": self.scheduler.completed,
+            "cache": self.cache.stats(),
+        }
+
+    async def _ai_play(
+        self, session: Session, time_left: Optional[float] = None, increment: float = 0.0
+    ) -> Optional[List[int]]:
+        session.check_memory()
+        engine = session.engine
+        if engine.draw_reason() is not None:
+            return None
+        grid = [row[:] for row in engine.board.grid]
+        # une graine par coup : le tirage ne dépend pas du worker qui l'exécute
+        seed = session.seed + len(session.history)
+        args = (engine.variant.name, grid, engine.turn, engine.history(), session.level, time_left, increment, seed)
+        session.pending += 1
+        try:
+            profile = get_level(session.level)
+            if profile.book and not engine.board.quiet_plies:
+                # niveaux sans bruit : recherches partagées entre sessions (sauf au
+                # milieu de coups de dames, où l'historique compte pour les nulles)
+                settings = AI.search_settings(profile.depth, None, engine.variant.name, nodes=profile.nodes)
+                key = (position_key(engine.board, engine.turn), settings)
+                # une recherche coupée par l'horloge ne vaut pas la clé
+                move, _ = await self.cache.get_or_compute_async(
+                    key, lambda: self.scheduler.submit(session.id, args), keep=lambda result: result[1]
+                )
+            else:
+                move, _ = await self.scheduler.submit(session.id, args)
+        finally:
+            session.pending -= 1
+        if move is None:
+            return None
+        session.play(tuple(move))
+        return list(move[:4])
+
+
+class Client:
+    """Client JSON lines minimal (tests en processus, scripts)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self._ids = itertools.count(1)
+
+    @classmethod
+    async def connect(cls, port: int, host: str = "127.0.0.1") -> "Client":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, op: str, **params: Any) -> Dict[str, Any]:
+        payload = dict(params, op=op, id=next(self._ids))
+        self.writer.write((json.dumps(payload) + "\n").encode("utf-8"))
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def _serve(port: int, workers: int, max_sessions: int) -> None:
+    server = DamesServer(workers=workers, max_sessions=max_sessions)
+    bound = await server.start(port=port)
+    print(f"Serveur de dames à l'écoute sur 127.0.0.1:{bound} ({workers} workers)", file=sys.stderr)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serveur multi-parties de dames (JSON lines).")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args.port, max(1, args.workers), args.max_sessions))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
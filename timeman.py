@@ -0,0 +1,71 @@
+# timeman.py : budget de temps par coup pour l'IA
+from typing import Dict, Optional, Tuple
+
+# Cadences : (temps initial en secondes, incrément par coup)
+TIME_CONTROLS: Dict[str, Tuple[float, float]] = {
+    "blitz": (180.0, 2.0),
+    "rapide": (600.0, 5.0),
+}
+
+
+class TimeManager:
+    """
+    Calcule le budget d'un coup à partir de la pendule restante, de
+    l'incrément, de la phase de jeu (nombre de pièces) et de la complexité
+    de la position (nombre de coups légaux, prise obligatoire).
+    """
+
+    def __init__(
+        self,
+        safety_margin: float = 0.3,
+        max_fraction: float = 0.25,
+        min_budget: float = 0.02,
+    ) -> None:
+        self.safety_margin = safety_margin
+        self.max_fraction = max_fraction
+        self.min_budget = min_budget
+
+    @staticmethod
+    def moves_to_go(pieces: int) -> int:
+        """Estimation du nombre de coups restants selon la phase de jeu."""
+        if pieces > 16:
+            return 25  # ouverture : beaucoup de coups à venir, on économise
+        if pieces > 8:
+            return 18  # milieu de partie
+        return 12  # finale
+
+    def budget(
+        self,
+        time_left: float,
+        increment: float,
+        pieces: int,
+        legal_moves: int,
+        forced_capture: bool = False,
+    ) -> float:
+        if legal_moves <= 1:
+            return self.min_budget
+
+        usable = max(0.0, time_left - self.safety_margin)
+        base = usable / self.moves_to_go(pieces) + increment * 0.8
+
+        complexity = 1.0 + min(0.5, max(-0.3, (legal_moves - 7) / 14))
+        if forced_capture:
+            # les échanges forcés méritent d'être lus plus loin
+            complexity *= 1.2
+
+        budget = min(base * complexity, usable * self.max_fraction)
+        return max(self.min_budget, budget)
+
+
+def parse_time_control(name: Optional[str]) -> Optional[Tuple[float, float]]:
+    """« blitz », « rapide » ou « base+incrément » en secondes (ex. « 300+3 »)."""
+    if not name:
+        return None
+    name = name.strip().lower()
+    if name in TIME_CONTROLS:
+        return TIME_CONTROLS[name]
+    base, _, inc = name.partition("+")
+    try:
+        return float(base), float(inc or 0)
+    except ValueError:
+        raise ValueError(f"cadence inconnue : {name!r}") from None
@@ -0,0 +1,219 @@
+# train_nnue.py : entraînement du réseau d'évaluation (nnue.py) par auto-jeu
+"""
+1. Auto-jeu : l'IA (évaluation matérielle) joue contre elle-même depuis des
+   ouvertures tirées au hasard (graine fixe). Chaque position rencontrée est
+   étiquetée par le score d'une recherche à `--depth` demi-coups, mêlé au
+   résultat de la partie (`--lambda`). Le réseau apprend ainsi à prédire à
+   profondeur nulle ce que la recherche voit plus loin.
+2. Entraînement : régression (erreur quadratique, Adam) en NumPy pur.
+3. `--match N` : parties au temps fixe par coup, réseau contre matériel.
+
+    python3 train_nnue.py --games 300 --depth 4 -o reseau.npz
+    python3 train_nnue.py --load reseau.npz --epochs 0 --match 20 --movetime 0.2
+
+Le réseau s'utilise ensuite avec `DAMES_RESEAU=reseau.npz python3 main.py`.
+"""
+import argparse
+import random
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ai import AI, MAX_DEPTH, Evaluator, MaterialEvaluator
+from engine import Engine, Variant, get_variant, legal_moves
+from nnue import NetworkEvaluator, feature_indices
+
+# Score d'une partie gagnée, en points de matériel (cible d'entraînement)
+RESULT_SCORE = 4.0
+# garde-fou : répétitions et absence de progrès terminent déjà les parties
+MAX_PLIES = 300
+
+
+def self_play(
+    variant: Variant, games: int, depth: int, seed: int, opening_plies: int = 6, result_weight: float = 0.25
+) -> Tuple[List[List[int]], List[float]]:
+    """Positions (entrées actives) et cibles, du point de vue des Blancs."""
+    rng = random.Random(seed)
+    positions: List[List[int]] = []
+    targets: List[float] = []
+    for game in range(games):
+        engine = Engine(variant)
+        ai = AI(engine, level=3, seed=seed + game)
+        scores: List[float] = []
+        result = 0.0
+        for ply in range(MAX_PLIES):
+            if engine.draw_reason() is not None:
+                break  # nulle : résultat 0
+            moves = legal_moves(engine.board, engine.turn)
+            if not moves:
+                result = -float(engine.turn)  # le camp au trait sans coup a perdu
+                break
+            if ply < opening_plies:
+                engine.play(rng.choice(moves))
+                continue
+            ai.ai_color = engine.turn
+            move, score = ai.search(depth)
+            positions.append(feature_indices(engine.board))
+            scores.append(score * engine.turn)
+            engine.play(move)
+        targets.extend((1 - result_weight) * s + result_weight * result * RESULT_SCORE for s in scores)
+        if (game + 1) % 10 == 0:
+            print(f"auto-jeu : {game + 1}/{games} parties, {len(positions)} positions")
+    return positions, targets
+
+
+def dense_inputs(positions: List[List[int]], inputs: int) -> np.ndarray:
+    x = np.zeros((len(positions), inputs), dtype=np.float32)
+    for i, active in enumerate(positions):
+        x[i, active] = 1.0
+    return x
+
+
+def init_network(size: int, hidden1: int, hidden2: int, seed: int) -> NetworkEvaluator:
+    rng = np.random.default_rng(seed)
+    inputs = 4 * size * size
+    return NetworkEvaluator(
+        rng.normal(0.0, 0.1, (inputs, hidden1)),
+        np.full(hidden1, 0.5),
+        rng.normal(0.0, 1.0 / np.sqrt(hidden1), (hidden2, hidden1)),
+        np.full(hidden2, 0.5),
+        rng.normal(0.0, 1.0 / np.sqrt(hidden2), hidden2),
+        0.0,
+        size,
+    )
+
+
+def train(
+    net: NetworkEvaluator, x: np.ndarray, y: np.ndarray, epochs: int, lr: float, batch: int, seed: int
+) -> NetworkEvaluator:
+    """Descente de gradient (Adam) sur l'erreur quadratique ; 10 % gardés pour la validation."""
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(x))
+    split = max(1, len(x) // 10)
+    val, fit = order[:split], order[split:]
+    params = [net.w1, net.b1, net.w2, net.b2, net.w3, np.array([net.b3], dtype=np.float32)]
+    moments = [np.zeros_like(p) for p in params]
+    squares = [np.zeros_like(p) for p in params]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+
+    def forward(xb: np.ndarray):
+        w1, b1, w2, b2, w3, b3 = params
+        a1 = xb @ w1 + b1
+        h1 = np.clip(a1, 0.0, 1.0)
+        a2 = h1 @ w2.T + b2
+        h2 = np.clip(a2, 0.0, 1.0)
+        return a1, h1, a2, h2, h2 @ w3 + b3[0]
+
+    for epoch in range(epochs):
+        rng.shuffle(fit)
+        for start in range(0, len(fit), batch):
+            idx = fit[start:start + batch]
+            xb, yb = x[idx], y[idx]
+            a1, h1, a2, h2, out = forward(xb)
+            w1, b1, w2, b2, w3, b3 = params
+            d_out = 2.0 * (out - yb) / len(idx)
+            d_a2 = np.outer(d_out, w3) * ((a2 > 0) & (a2 < 1))
+            d_a1 = (d_a2 @ w2) * ((a1 > 0) & (a1 < 1))
+            grads = [
+                xb.T @ d_a1, d_a1.sum(axis=0),
+                d_a2.T @ h1, d_a2.sum(axis=0),
+                h2.T @ d_out, np.array([d_out.sum()], dtype=np.float32),
+            ]
+            step += 1
+            for p, g, m, v in zip(params, grads, moments, squares):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                p -= lr * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+        fit_loss = float(np.mean((forward(x[fit])[-1] - y[fit]) ** 2))
+        val_loss = float(np.mean((forward(x[val])[-1] - y[val]) ** 2))
+        print(f"époque {epoch + 1}/{epochs} : perte {fit_loss:.4f}, validation {val_loss:.4f}")
+
+    w1, b1, w2, b2, w3, b3 = params
+    return NetworkEvaluator(w1, b1, w2, b2, w3, float(b3[0]), net.size)
+
+
+def match(
+    variant: Variant, first: Evaluator, second: Evaluator, games: int, movetime: float, seed: int
+) -> Tuple[int, int, int]:
+    """(victoires, nulles, défaites) de `first`, couleurs alternées, même temps par coup."""
+    rng = random.Random(seed)
+    wins = draws = losses = 0
+    for game in range(games):
+        if game % 2 == 0:
+            opening_seed = rng.getrandbits(32)  # chaque ouverture est jouée des deux côtés
+        opening = random.Random(opening_seed)
+        engine = Engine(variant)
+        first_color = 1 if game % 2 == 0 else -1
+        players = {
+            first_color: AI(engine, level=3, evaluator=first, seed=seed + game),
+            -first_color: AI(engine, level=3, evaluator=second, seed=seed + game),
+        }
+        winner = 0
+        for ply in range(MAX_PLIES):
+            if engine.draw_reason() is not None:
+                break
+            moves = legal_moves(engine.board, engine.turn)
+            if not moves:
+                winner = -engine.turn
+                break
+            if ply < 4:
+                engine.play(opening.choice(moves))
+                continue
+            ai = players[engine.turn]
+            ai.ai_color = engine.turn
+            move, _ = ai.search(MAX_DEPTH, perf_counter() + movetime)
+            engine.play(move)
+        if winner == first_color:
+            wins += 1
+        elif winner == 0:
+            draws += 1
+        else:
+            losses += 1
+    return wins, draws, losses
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Entraîne le réseau d'évaluation par auto-jeu.")
+    parser.add_argument("--variante", default="classique", help="règles : classique, anglaise, bresilienne, internationale")
+    parser.add_argument("--games", type=int, default=200, help="parties d'auto-jeu")
+    parser.add_argument("--depth", type=int, default=4, help="profondeur des recherches d'étiquetage")
+    parser.add_argument("--lambda", dest="result_weight", type=float, default=0.25, help="poids du résultat de partie")
+    parser.add_argument("--hidden", type=int, nargs=2, default=(32, 16), help="tailles des couches cachées")
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--load", help="poids de départ (.npz)")
+    parser.add_argument("-o", "--output", default="reseau.npz")
+    parser.add_argument("--match", type=int, default=0, help="parties réseau contre matériel après l'entraînement")
+    parser.add_argument("--movetime", type=float, default=0.1, help="secondes par coup pendant le match")
+    args = parser.parse_args(argv)
+
+    variant = get_variant(args.variante)
+    print(f"graine {args.seed}")
+    if args.load:
+        net = NetworkEvaluator.load(args.load)
+    else:
+        net = init_network(variant.size, args.hidden[0], args.hidden[1], args.seed)
+
+    if args.epochs > 0:
+        start = perf_counter()
+        positions, targets = self_play(variant, args.games, args.depth, args.seed, result_weight=args.result_weight)
+        print(f"{len(positions)} positions en {perf_counter() - start:.1f} s")
+        x = dense_inputs(positions, net.w1.shape[0])
+        y = np.asarray(targets, dtype=np.float32)
+        net = train(net, x, y, args.epochs, args.lr, args.batch, args.seed)
+        net.save(args.output)
+        print(f"poids écrits dans {args.output} ({net.name})")
+
+    if args.match > 0:
+        wins, draws, losses = match(variant, net, MaterialEvaluator(), args.match, args.movetime, args.seed)
+        print(f"réseau contre matériel ({args.movetime:g} s/coup) : +{wins} ={draws} -{losses}")
+
+
+if __name__ == "__main__":
+    main()
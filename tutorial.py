@@ -1,5 +1,5 @@
 # tutorial.py
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
 import pygame
 
 
@@ -43,9 +43,8 @@ class Tutorial:
                 "lines": [
                     "L'IA contrôle par défaut les pions noirs.",
                     "Changez la difficulté à la volée :",
-                    "- 1 : niveau facile (coups légaux aléatoires)",
-                    "- 2 : niveau intermédiaire (captures prioritaires)",
-                    "- 3 : niveau difficile (minimax rapide)",
+                    "- 1 à 3 : débutant, facile, moyen (évaluation bruitée)",
+                    "- 4 à 6 : confirmé, fort, expert (recherche plus longue)",
                 ],
             },
             {
@@ -71,6 +70,9 @@ class Tutorial:
         ]
         self.current_index: int = 0
         self.active: bool = False
+        # (clé, surface) du dernier voile et de la dernière carte rendus
+        self._veil: Optional[Tuple[Tuple[int, int], pygame.Surface]] = None
+        self._card: Optional[Tuple[Tuple[Any, ...], pygame.Surface]] = None
 
     # État
     def start(self) -> None:
@@ -121,18 +123,32 @@ class Tutorial:
     def draw(self, screen: pygame.Surface, font: pygame.font.Font, theme: dict) -> None:
         """
         Dessine une carte centrale semi-transparente par-dessus le jeu.
+        Voile et carte sont rendus une fois par (slide, taille, thème, police)
+        puis seulement blittés ; les cotes suivent la taille de l'écran.
         """
         width, height = screen.get_size()
-        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-        # voile global léger
-        overlay.fill((0, 0, 0, 150))
-        screen.blit(overlay, (0, 0))
+        key = (width, height)
+        if self._veil is None or self._veil[0] != key:
+            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+            # voile global léger
+            overlay.fill((0, 0, 0, 150))
+            self._veil = (key, overlay)
+        screen.blit(self._veil[1], (0, 0))
 
         card_width = int(width * 0.8)
         card_height = int(height * 0.6)
         card_x = (width - card_width) // 2
         card_y = (height - card_height) // 2
 
+        key = (self.current_index, card_width, card_height, tuple(theme.items()), font)
+        if self._card is None or self._card[0] != key:
+            scale = min(width / 640, height / 700)
+            self._card = (key, self._render_card(card_width, card_height, scale, font, theme))
+        screen.blit(self._card[1], (card_x, card_y))
+
+    def _render_card(
+        self, card_width: int, card_height: int, scale: float, font: pygame.font.Font, theme: dict
+    ) -> pygame.Surface:
         card_surface = pygame.Surface((card_width, card_height), pygame.SRCALPHA)
 
         # fond type "glassmorphism" cosy
@@ -144,7 +160,7 @@ class Tutorial:
             card_surface,
             (255, 255, 255, 30),
             card_surface.get_rect(),
-            border_radius=24,
+            border_radius=round(24 * scale),
         )
 
         # Récup slide
@@ -155,24 +171,21 @@ class Tutorial:
         # Titre
         title_font = font
         title_surf = title_font.render(title, True, theme.get("text", (230, 230, 230)))
-        title_rect = title_surf.get_rect(center=(card_width // 2, 60))
+        title_rect = title_surf.get_rect(center=(card_width // 2, round(60 * scale)))
         card_surface.blit(title_surf, title_rect)
 
         # Texte
         body_color = theme.get("text", (230, 230, 230))
-        y = 110
+        y = round(110 * scale)
         for line in lines:
             line_surf = font.render(line, True, body_color)
             rect = line_surf.get_rect(center=(card_width // 2, y))
             card_surface.blit(line_surf, rect)
-            y += 30
+            y += round(30 * scale)
 
         # Indicateurs de navigation
         nav_text = "← Précédent    •    → Suivant    •    T / Échap : Fermer"
         nav_surf = font.render(nav_text, True, body_color)
-        nav_rect = nav_surf.get_rect(center=(card_width // 2, card_height - 40))
+        nav_rect = nav_surf.get_rect(center=(card_width // 2, card_height - round(40 * scale)))
         card_surface.blit(nav_surf, nav_rect)
-
-        # Dessin final
-        screen.blit(card_surface, (card_x, card_y))
-
+        return card_surface